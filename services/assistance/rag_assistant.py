@@ -2,7 +2,17 @@
 RAG-based Assistant Service using shared voice assistant modules
 """
 
+import os
+import re
 import sys
+import hashlib
+import logging
+import pickle
+from functools import lru_cache
+from itertools import cycle
+from operator import itemgetter
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import random
 
@@ -10,23 +20,25 @@ import random
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from shared.base.voice_assistant import BaseVoiceAssistant
+from shared.speech.text_processor import KeywordMatcher
 
 # RAG and LLM imports
 try:
-    from langchain_community.llms import LlamaCpp
     from langchain.text_splitter import RecursiveCharacterTextSplitter
     from langchain_community.vectorstores import FAISS
+    from langchain_community.vectorstores.utils import DistanceStrategy
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    import faiss
+    import llama_cpp
+    from llama_cpp import Llama, GGML_TYPE_Q8_0
     from langchain.prompts import (
-        ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate,
-        MessagesPlaceholder, PromptTemplate
+        ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
     )
-    from langchain.schema.runnable import RunnablePassthrough, RunnableLambda
+    from langchain.schema.runnable import RunnableLambda
+    from langchain_core.runnables import Runnable
     from langchain.schema.output_parser import StrOutputParser
     from langchain_core.documents import Document
-    from langchain.memory import ConversationBufferMemory
-    from operator import itemgetter
     from langchain.schema import AIMessage, HumanMessage
-    from sentence_transformers import SentenceTransformer
     import numpy as np
     LANGCHAIN_AVAILABLE = True
 except ImportError as e:
@@ -35,30 +47,315 @@ except ImportError as e:
     LANGCHAIN_AVAILABLE = False
     sys.exit(1)
 
+# Optional int8 ONNX Runtime backend for the embedding model
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Optional JIT-compiled similarity scan for the response cache
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _best_match_numpy(matrix, vector):
+    """Return (row, score) of the row of matrix with the highest dot product with vector"""
+    scores = matrix @ vector
+    best = int(np.argmax(scores))
+    return best, float(scores[best])
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _best_match_numba(matrix, vector):
+        """Fused dot-product + argmax scan (no temporary scores array)"""
+        best = -1
+        best_score = -np.inf
+        for i in range(matrix.shape[0]):
+            score = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                score += matrix[i, j] * vector[j]
+            if score > best_score:
+                best_score = score
+                best = i
+        return best, best_score
+    
+    best_match = _best_match_numba
+else:
+    best_match = _best_match_numpy
+
+@lru_cache(maxsize=None)
+def get_text_splitter(chunk_size, chunk_overlap):
+    """
+    Get a shared text splitter for the given chunk settings
+    
+    Args:
+        chunk_size: Maximum chunk length in characters
+        chunk_overlap: Characters shared between consecutive chunks
+    
+    Returns:
+        RecursiveCharacterTextSplitter instance
+    """
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+class QuantizedOnnxEncoder:
+    """
+    Int8 dynamically-quantized ONNX Runtime encoder
+    Mirrors the SentenceTransformer pipeline (mean pooling + L2 normalization)
+    """
+    
+    QUANTIZED_FILE = "model_quantized.onnx"
+    MAX_SEQ_LENGTH = 256
+    
+    def __init__(self, model_name, export_dir):
+        repo_id = model_name if '/' in model_name else f"sentence-transformers/{model_name}"
+        model_dir = Path(export_dir) / model_name.replace('/', '_')
+        
+        # Export and quantize once, then reuse the quantized model
+        if not (model_dir / self.QUANTIZED_FILE).exists():
+            model = ORTModelForFeatureExtraction.from_pretrained(
+                repo_id, export=True, provider="CPUExecutionProvider"
+            )
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=model_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+            AutoTokenizer.from_pretrained(repo_id).save_pretrained(model_dir)
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, file_name=self.QUANTIZED_FILE, provider="CPUExecutionProvider"
+        )
+    
+    def get_sentence_embedding_dimension(self):
+        """Get the embedding dimension"""
+        return self.model.config.hidden_size
+    
+    def encode(self, texts, batch_size=32, **kwargs):
+        """Encode texts into L2-normalized float32 embeddings"""
+        if isinstance(texts, str):
+            texts = [texts]
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.MAX_SEQ_LENGTH,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            
+            # Mean pooling over non-padding tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        
+        if not batches:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.concatenate(batches)
+
+class LlamaRunnable(Runnable):
+    """Minimal LangChain runnable around a native llama.cpp model"""
+    
+    def __init__(self, llama, max_tokens=256, temperature=0.7, top_p=1):
+        self.llama = llama
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+    
+    def invoke(self, input, config=None, **kwargs):
+        """Generate a completion for a prompt string or prompt value"""
+        prompt = input.to_string() if hasattr(input, 'to_string') else str(input)
+        output = self.llama(
+            prompt,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            top_p=self.top_p
+        )
+        return output["choices"][0]["text"]
+    
+    def stream(self, input, config=None, **kwargs):
+        """Yield completion text as tokens are generated"""
+        prompt = input.to_string() if hasattr(input, 'to_string') else str(input)
+        for chunk in self.llama(
+            prompt,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            stream=True
+        ):
+            yield chunk["choices"][0]["text"]
+
 class LocalEmbeddings:
-    """Local embeddings using SentenceTransformers"""
+    """Local embeddings using an int8 ONNX model, or SentenceTransformers as fallback"""
     
-    def __init__(self, model_name):
+    ENCODE_BATCH_SIZE = 64
+    # Batches encoded concurrently (the ONNX/torch kernels release the GIL)
+    PARALLEL_LIMIT = 2
+    # Recent query embeddings kept in memory (repeated questions skip the encoder)
+    QUERY_CACHE_SIZE = 128
+    
+    def __init__(self, model_name, cache_dir=None, onnx_dir=None, batch_size=ENCODE_BATCH_SIZE,
+                 quantized=True, parallel_limit=PARALLEL_LIMIT, logger=None):
         self.model_name = model_name
         self.model = None
+        # Backend of the loaded model ("onnx_int8" or "sentence_transformers")
+        self.backend = None
+        self.logger = logger or logging.getLogger(__name__)
+        self.batch_size = batch_size
+        self.parallel_limit = max(1, parallel_limit)
+        # int8 ONNX weights are only used when requested and optimum is installed
+        self.onnx_dir = Path(onnx_dir) if onnx_dir and quantized else None
+        
+        # Optional on-disk cache of document embeddings (one directory per model/backend)
+        self._cache_root = Path(cache_dir) if cache_dir else None
+        self.cache_dir = None
+        self._cache_index = None
+        self._cache_vectors = None
+        self._query_cache = OrderedDict()
     
     def load_model(self):
         """Load the embedding model locally"""
         if self.model is None:
-            self.model = SentenceTransformer(self.model_name)
+            cache_name = self.model_name.replace('/', '_')
+            
+            if ONNX_AVAILABLE and self.onnx_dir is not None:
+                try:
+                    self.model = QuantizedOnnxEncoder(self.model_name, self.onnx_dir)
+                    self.backend = "onnx_int8"
+                    cache_name += "_onnx_int8"
+                except Exception as e:
+                    self.logger.warning(f"Quantized ONNX embeddings unavailable ({e}), using SentenceTransformers")
+            
+            if self.model is None:
+                # Imported here so torch is only loaded when the ONNX backend is not used
+                from sentence_transformers import SentenceTransformer
+                self.model = SentenceTransformer(self.model_name)
+                self.backend = "sentence_transformers"
+            
+            if self._cache_root is not None:
+                self.cache_dir = self._cache_root / cache_name
         return self.model
     
-    def embed_documents(self, texts):
-        """Embed a list of documents"""
+    def _load_cache(self):
+        """Load cached text hashes and memory-map the cached vectors"""
+        if self._cache_index is not None:
+            return
+        
+        keys = []
+        keys_path = self.cache_dir / "keys.txt"
+        if keys_path.exists():
+            with open(keys_path, 'r', encoding='utf-8') as f:
+                keys = f.read().split()
+        
+        dim = self.load_model().get_sentence_embedding_dimension()
+        vectors_path = self.cache_dir / "vectors.f32"
+        rows = vectors_path.stat().st_size // (4 * dim) if vectors_path.exists() else 0
+        
+        # An interrupted append can leave vectors without keys, keys without
+        # vectors or a partial row; cut both files back to the rows they share
+        # so later appends stay aligned
+        if vectors_path.exists() and (rows != len(keys) or vectors_path.stat().st_size != rows * 4 * dim):
+            rows = min(len(keys), rows)
+            keys = keys[:rows]
+            with open(vectors_path, 'r+b') as f:
+                f.truncate(rows * 4 * dim)
+            with open(keys_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(f"{key}\n" for key in keys))
+        elif not vectors_path.exists() and keys:
+            keys = []
+            keys_path.unlink()
+        
+        self._cache_index = {key: row for row, key in enumerate(keys)}
+        self._map_cache_vectors()
+    
+    def _map_cache_vectors(self):
+        """Memory-map the cached vectors file"""
+        rows = len(self._cache_index)
+        if rows == 0:
+            self._cache_vectors = None
+            return
+        
+        dim = self.load_model().get_sentence_embedding_dimension()
+        self._cache_vectors = np.memmap(
+            self.cache_dir / "vectors.f32", dtype=np.float32, mode='r', shape=(rows, dim)
+        )
+    
+    def _append_to_cache(self, keys, vectors):
+        """Append new embeddings to the on-disk cache"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Vectors first; _load_cache trims whichever file ran ahead if a write is interrupted
+        with open(self.cache_dir / "vectors.f32", 'ab') as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self.cache_dir / "keys.txt", 'a', encoding='utf-8') as f:
+            f.write(''.join(f"{key}\n" for key in keys))
+        
+        start = len(self._cache_index)
+        for offset, key in enumerate(keys):
+            self._cache_index[key] = start + offset
+        self._map_cache_vectors()
+    
+    def _encode(self, texts, batch_size=None):
+        """Encode texts into an L2-normalized float32 array"""
         model = self.load_model()
-        embeddings = model.encode(texts)
-        return embeddings.tolist()
+        return model.encode(
+            texts,
+            batch_size=batch_size or self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+    
+    def _encode_batches(self, texts):
+        """Encode texts in batches, running up to parallel_limit batches at once"""
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if self.parallel_limit == 1 or len(batches) == 1:
+            return self._encode(texts)
+        
+        with ThreadPoolExecutor(max_workers=self.parallel_limit) as executor:
+            return np.vstack(list(executor.map(self._encode, batches)))
+    
+    def embed_documents(self, texts):
+        """Embed a list of documents, reusing cached embeddings when available"""
+        self.load_model()
+        if self.cache_dir is None:
+            return self._encode_batches(texts)
+        
+        self._load_cache()
+        keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest() for text in texts]
+        
+        # Encode all cache misses in a single batch
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._cache_index:
+                missing.setdefault(key, text)
+        if missing:
+            self._append_to_cache(list(missing), self._encode_batches(list(missing.values())))
+        
+        return np.asarray(self._cache_vectors[[self._cache_index[key] for key in keys]])
     
     def embed_query(self, text):
-        """Embed a single query"""
-        model = self.load_model()
-        embedding = model.encode([text])
-        return embedding[0].tolist()
+        """Embed a single query, reusing the embedding of recently seen queries"""
+        vector = self._query_cache.get(text)
+        if vector is not None:
+            self._query_cache.move_to_end(text)
+            return vector
+        
+        vector = self._encode([text], batch_size=1)[0]
+        vector.setflags(write=False)  # shared between callers
+        self._query_cache[text] = vector
+        if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return vector
 
 class RAGAssistant(BaseVoiceAssistant):
     """
@@ -68,10 +365,37 @@ class RAGAssistant(BaseVoiceAssistant):
     
     # RAG Configuration
     EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'  # Smaller, faster local model
+    EMBEDDING_QUANT = 'int8'  # int8 ONNX weights; 'fp32' uses SentenceTransformers
+    EMBEDDING_BACKEND_FILE = "embedding_backend.txt"  # Saved with the vector store
     CHUNK_SIZE = 700
     CHUNK_OVERLAP = 70
     SEARCH_K = 3
     
+    # HNSW index settings (flat index is exact and fast enough for small knowledge bases)
+    HNSW_MIN_CHUNKS = 1000
+    HNSW_M = 32
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64
+    # Scalar quantizer for HNSW vectors ('QT_8bit' is 4x smaller; 'QT_fp16' if recall drops; None keeps float32)
+    HNSW_SQ_TYPE = 'QT_8bit'
+    
+    # Retrieval results are reused for repeated queries
+    RETRIEVAL_CACHE_SIZE = 32
+    MIN_QUERY_LENGTH = 4
+    
+    # Conversation turns kept in the prompt (bounds prompt size within n_ctx)
+    MEMORY_WINDOW_TURNS = 3
+    
+    # Generation cap; answers are meant to be concise and are spoken as they stream
+    LLM_MAX_TOKENS = 160
+    
+    # Answers reused for near-duplicate questions (cosine similarity of query embeddings)
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_THRESHOLD = 0.93
+    
+    # Sentence boundary used to split streamed responses for TTS
+    SENTENCE_END = re.compile(r'[.!?…]\s')
+    
     # Pre-defined responses for natural conversation
     responses = {
         'reassuring': [
@@ -99,7 +423,11 @@ class RAGAssistant(BaseVoiceAssistant):
         "au revoir": "Au revoir et bonne journée !"
     }
     
-    def __init__(self, doc_path=None, llm_model_path=None, whisper_model='small'):
+    EXIT_COMMANDS = ['quitter', 'sortir', 'arrêter', 'au revoir', 'bye', 'exit', 'quit']
+    
+    def __init__(self, doc_path=None, llm_model_path=None, whisper_model='small',
+                 embed_batch_size=LocalEmbeddings.ENCODE_BATCH_SIZE, embedding_quant=EMBEDDING_QUANT,
+                 parallel_limit=LocalEmbeddings.PARALLEL_LIMIT, chunk_size=CHUNK_SIZE):
         """
         Initialize RAG assistant
         
@@ -107,10 +435,22 @@ class RAGAssistant(BaseVoiceAssistant):
             doc_path: Path to knowledge base document
             llm_model_path: Path to LLM model file
             whisper_model: Whisper model size
+            embed_batch_size: Chunks encoded per batch when building the vector store
+            embedding_quant: Embedding weights precision ('int8' or 'fp32')
+            parallel_limit: Embedding batches encoded concurrently when building the vector store
+            chunk_size: Knowledge base chunk length in characters (overlap is 10%)
         """
         # Initialize base voice assistant
         super().__init__("RAGAssistant", whisper_model)
         
+        # Keyword matchers for small talk and exit commands
+        self._common_matcher = KeywordMatcher(self.common_responses)
+        self._exit_matcher = KeywordMatcher(self.EXIT_COMMANDS, whole_words=True)
+        
+        # Rotate through the thinking messages in a fixed, once-shuffled order
+        thinking = self.responses['thinking']
+        self._thinking_messages = cycle(random.sample(thinking, len(thinking)))
+        
         if not LANGCHAIN_AVAILABLE:
             raise RuntimeError("Langchain dependencies are not available. The service cannot start.")
         
@@ -122,6 +462,11 @@ class RAGAssistant(BaseVoiceAssistant):
         
         self.doc_path = Path(doc_path)
         self.llm_model_path = Path(llm_model_path)
+        self.embed_batch_size = embed_batch_size
+        self.embedding_quant = embedding_quant
+        self.parallel_limit = parallel_limit
+        self.chunk_size = chunk_size
+        self.chunk_overlap = self.CHUNK_OVERLAP if chunk_size == self.CHUNK_SIZE else chunk_size // 10
         self.vectorstore_dir = self.paths.root_dir / "backup_important_files" / "vectorstore_faiss_md"
         
         # Verify essential files
@@ -149,10 +494,19 @@ class RAGAssistant(BaseVoiceAssistant):
         self.logger.info("Initializing RAG system...")
         
         # Initialize embeddings
-        self.logger.info(f"Loading local embedding model: {self.EMBEDDING_MODEL_NAME}")
-        self.embeddings = LocalEmbeddings(self.EMBEDDING_MODEL_NAME)
-        # Pre-load the model to avoid delays during runtime
+        self.logger.info(f"Loading local embedding model: {self.EMBEDDING_MODEL_NAME} ({self.embedding_quant})")
+        self.embeddings = LocalEmbeddings(
+            self.EMBEDDING_MODEL_NAME,
+            cache_dir=self.vectorstore_dir.parent / "embed_cache",
+            onnx_dir=self.paths.models_dir / "embeddings",
+            batch_size=self.embed_batch_size,
+            quantized=self.embedding_quant == 'int8',
+            parallel_limit=self.parallel_limit,
+            logger=self.logger
+        )
+        # Pre-load the model and run one dummy query so the first real query is not slowed down
         self.embeddings.load_model()
+        self.embeddings.embed_query("warm-up")
         self.logger.info("Local embedding model loaded successfully")
         
         # Load or create vector store
@@ -161,11 +515,8 @@ class RAGAssistant(BaseVoiceAssistant):
         # Initialize LLM
         self._init_llm()
         
-        # Initialize conversation memory
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
+        # Initialize conversation memory (user/assistant messages of the last turns only)
+        self.memory = deque(maxlen=2 * self.MEMORY_WINDOW_TURNS)
         
         # Create RAG chain
         self._create_rag_chain()
@@ -177,98 +528,260 @@ class RAGAssistant(BaseVoiceAssistant):
     
     def _load_or_create_vectorstore(self):
         """Load existing vectorstore or create new one"""
-        if self.vectorstore_dir.exists():
-            self.logger.info("Loading existing vector store...")
-            self.vectorstore = FAISS.load_local(
-                str(self.vectorstore_dir),
-                self.embeddings,
-                allow_dangerous_deserialization=True
+        # The generic FAISS build lacks the SIMD distance kernels and prefetching
+        compile_options = faiss.get_compile_options()
+        self.logger.info(f"FAISS compile options: {compile_options}")
+        if 'AVX2' not in compile_options and 'AVX512' not in compile_options:
+            self.logger.warning("FAISS is running without AVX2/AVX-512 kernels; vector search will be slower")
+        
+        saved_backend = self._saved_embedding_backend() if self.vectorstore_dir.exists() else None
+        if saved_backend is not None and saved_backend != self.embeddings.backend:
+            # Vectors from another embedding backend are not comparable with the query vectors
+            self.logger.warning(
+                f"Vector store was built with {saved_backend} embeddings, "
+                f"now using {self.embeddings.backend}; rebuilding it"
             )
+            self._create_vectorstore()
+        elif saved_backend is not None:
+            self.logger.info("Loading existing vector store...")
+            self.vectorstore = self._load_vectorstore()
+            index = self.vectorstore.index
+            if hasattr(index, 'hnsw'):
+                index.hnsw.efSearch = self.HNSW_EF_SEARCH
+            elif index.metric_type != faiss.METRIC_INNER_PRODUCT or index.ntotal >= self.HNSW_MIN_CHUNKS:
+                self._rebuild_index()
         else:
             self.logger.info("Creating new vector store...")
             self._create_vectorstore()
     
-    def _create_vectorstore(self):
-        """Create vector store from knowledge base document"""
+    def _saved_embedding_backend(self):
+        """
+        Read the embedding backend recorded with the saved vector store
+        
+        Returns:
+            Backend name; stores saved before it was recorded used SentenceTransformers
+        """
+        backend_path = self.vectorstore_dir / self.EMBEDDING_BACKEND_FILE
+        if not backend_path.exists():
+            return "sentence_transformers"
+        return backend_path.read_text(encoding='utf-8').strip()
+    
+    def _load_vectorstore(self):
+        """
+        Load the saved vector store, memory-mapping the FAISS index where supported
+        
+        Returns:
+            FAISS vector store
+        """
+        index_path = self.vectorstore_dir / "index.faiss"
+        
+        # Ask the kernel to start reading the index into the page cache
+        if hasattr(os, 'posix_fadvise'):
+            fd = os.open(index_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        
+        index = None
+        if hasattr(faiss, 'IO_FLAG_MMAP_IFC'):
+            # FAISS >= 1.10 can map the vectors of flat storage (IndexFlatIP and the
+            # storage under IndexHNSWFlat), so they are paged in on demand and
+            # shared between processes; older builds have no mapping for these indexes
+            try:
+                index = faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP_IFC)
+            except RuntimeError as e:
+                self.logger.warning(f"Memory-mapped index load failed ({e}), reading it into memory")
+        
+        if index is None:
+            index = faiss.read_index(str(index_path))
+        
+        # Docstore and id mapping as pickled by FAISS.save_local
+        with open(self.vectorstore_dir / "index.pkl", 'rb') as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+    
+    def _split_document(self):
+        """
+        Split the knowledge base into chunks, reusing the cached split when still valid
+        
+        Returns:
+            List of chunk strings
+        """
+        cache_path = self.vectorstore_dir.with_suffix('.chunks.pkl')
+        cache_key = (self.doc_path.stat().st_mtime_ns, self.chunk_size, self.chunk_overlap)
+        
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('key') == cache_key:
+                    self.logger.info(f"Loaded document chunks from {cache_path}")
+                    return cached['chunks']
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable chunk cache: {e}")
+        
         # Load document
         with open(self.doc_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
         # Split into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.CHUNK_SIZE,
-            chunk_overlap=self.CHUNK_OVERLAP
-        )
+        chunks = get_text_splitter(self.chunk_size, self.chunk_overlap).split_text(content)
+        
+        cache_path.parent.mkdir(exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump({'key': cache_key, 'chunks': chunks}, f, protocol=pickle.HIGHEST_PROTOCOL)
         
-        chunks = text_splitter.split_text(content)
+        return chunks
+    
+    def _create_vectorstore(self):
+        """Create vector store from knowledge base document"""
+        chunks = self._split_document()
         documents = [Document(page_content=chunk) for chunk in chunks]
         
         self.logger.info(f"Created {len(documents)} document chunks")
         
-        # Create vector store
-        self.vectorstore = FAISS.from_documents(documents, self.embeddings)
+        # Embed every chunk up front in batches into one contiguous (N, dim) matrix
+        vectors = np.ascontiguousarray(self.embeddings.embed_documents(chunks), dtype=np.float32)
+        
+        # Create vector store (inner product == cosine on normalized embeddings)
+        self.vectorstore = self._build_vectorstore(documents, vectors)
         
         # Save vector store
         self.vectorstore_dir.parent.mkdir(exist_ok=True)
         self.vectorstore.save_local(str(self.vectorstore_dir))
+        (self.vectorstore_dir / self.EMBEDDING_BACKEND_FILE).write_text(self.embeddings.backend, encoding='utf-8')
         
         self.logger.info(f"Vector store saved to {self.vectorstore_dir}")
     
+    def _build_vectorstore(self, documents, vectors):
+        """
+        Build a FAISS vector store from precomputed embeddings in a single index add
+        
+        Args:
+            documents: Documents, one per row of vectors
+            vectors: Contiguous float32 array of shape (len(documents), dim), normalized in place
+        
+        Returns:
+            FAISS vector store using inner-product search
+        """
+        dim = vectors.shape[1]
+        
+        # Unit-length vectors make inner product equal to cosine similarity
+        faiss.normalize_L2(vectors)
+        
+        if len(documents) >= self.HNSW_MIN_CHUNKS:
+            if self.HNSW_SQ_TYPE:
+                qtype = getattr(faiss.ScalarQuantizer, self.HNSW_SQ_TYPE)
+                index = faiss.IndexHNSWSQ(dim, qtype, self.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexHNSWFlat(dim, self.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+            # Learns the per-dimension quantizer ranges (no-op for flat storage)
+            index.train(vectors)
+            index.add(vectors)
+            index.hnsw.efSearch = self.HNSW_EF_SEARCH
+            self.logger.info(
+                f"Built HNSW index (M={self.HNSW_M}, storage={self.HNSW_SQ_TYPE or 'float32'}) "
+                f"over {len(documents)} chunks"
+            )
+        else:
+            index = faiss.IndexFlatIP(dim)
+            index.add(vectors)
+            self.logger.info(f"Built flat index over {len(documents)} chunks")
+        
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore({str(i): doc for i, doc in enumerate(documents)}),
+            index_to_docstore_id={i: str(i) for i in range(len(documents))},
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+    
+    def _rebuild_index(self):
+        """
+        Rebuild a saved flat index from its stored vectors
+        
+        Used for L2 indexes saved before the switch to inner product, and for
+        flat indexes that have outgrown linear search (rebuilt as HNSW).
+        """
+        self.logger.info(f"Rebuilding flat index ({self.vectorstore.index.ntotal} vectors)...")
+        
+        vectors = self.vectorstore.index.reconstruct_n(0, self.vectorstore.index.ntotal)
+        documents = [
+            self.vectorstore.docstore.search(self.vectorstore.index_to_docstore_id[i])
+            for i in range(len(vectors))
+        ]
+        
+        self.vectorstore = self._build_vectorstore(documents, np.ascontiguousarray(vectors, dtype=np.float32))
+        self.vectorstore.save_local(str(self.vectorstore_dir))
+    
     def _init_llm(self):
         """Initialize LLM model"""
         self.logger.info(f"Initializing LLM: {self.llm_model_path}")
         
-        # Try different configurations until one works
-        configs = [
-            {
-                "n_ctx": 512, 
-                "n_batch": 32,
-                "n_threads": 2,
-                "use_mlock": False,
-                "use_mmap": True
-            },
-            {
-                "n_ctx": 256,
-                "n_batch": 16,
-                "n_threads": 1,
-                "use_mlock": False,
-                "use_mmap": False
-            },
-            {
-                "n_ctx": 128,
-                "n_batch": 8,
-                "n_threads": 1,
-                "use_mlock": False,
-                "use_mmap": True,
-                "low_vram": True
-            }
-        ]
+        # One thread per physical core for both prompt eval and generation
+        n_threads = max(1, (os.cpu_count() or 2) // 2)
         
-        for i, config in enumerate(configs):
-            try:
-                self.logger.info(f"Trying LLM config {i+1}: {config}")
-                self.llm = LlamaCpp(
-                    model_path=str(self.llm_model_path),
-                    temperature=0.7,
-                    max_tokens=256,
-                    top_p=1,
-                    verbose=False,
-                    **config
-                )
-                self.logger.info("LLM initialized successfully")
-                return
-            except Exception as e:
-                self.logger.warning(f"LLM config {i+1} failed: {e}")
-                if i == len(configs) - 1:
-                    raise RuntimeError("All LLM configurations failed") from e
+        try:
+            llama = Llama(
+                model_path=str(self.llm_model_path),
+                n_ctx=512,
+                n_batch=128,
+                n_threads=n_threads,
+                n_threads_batch=n_threads,
+                n_gpu_layers=0,
+                use_mmap=True,
+                use_mlock=False,
+                flash_attn=True,
+                type_k=GGML_TYPE_Q8_0,  # q8_0 KV cache halves KV bandwidth
+                type_v=GGML_TYPE_Q8_0,
+                verbose=False
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize LLM: {e}") from e
+        
+        # Confirms which SIMD kernels (e.g. AVX_VNNI) this llama.cpp build uses
+        self.logger.info(f"llama.cpp system info: {llama_cpp.llama_print_system_info().decode('utf-8', 'replace').strip()}")
+        
+        # Run one token through the model so the mmapped weights are paged in
+        # and the compute buffers allocated before the first user turn
+        try:
+            llama(" ", max_tokens=1)
+        except Exception as e:
+            self.logger.warning(f"LLM warm-up failed: {e}")
+        
+        self.llm = LlamaRunnable(llama, max_tokens=self.LLM_MAX_TOKENS, temperature=0.7, top_p=1)
+        self.logger.info(f"LLM initialized successfully ({n_threads} threads)")
     
     def _create_rag_chain(self):
         """Create RAG processing chain"""
-        # Create retriever
-        self.retriever = self.vectorstore.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": self.SEARCH_K}
-        )
+        # Retrieval searches the vector store directly (see _retrieve)
+        self._search_k = self.SEARCH_K
+        self._retrieval_cache = OrderedDict()
+        
+        # Previous user question and its embedding, used to give follow-ups context
+        self._last_question = None
+        self._last_query_vector = None
+        
+        # Ring buffer of query embeddings and their generated answers
+        self._response_vectors = None
+        self._response_texts = []
+        self._response_next = 0
+        
+        # Compile the similarity scan now rather than on the first cache lookup;
+        # the query vector is read-only like those from embed_query, which numba
+        # compiles separately from writable arrays
+        warmup_vector = np.zeros(1, dtype=np.float32)
+        warmup_vector.setflags(write=False)
+        best_match(np.zeros((1, 1), dtype=np.float32), warmup_vector)
         
         # Create prompt template
         system_prompt = """Tu es un assistant technique français compétent et serviable. 
@@ -286,70 +799,219 @@ class RAGAssistant(BaseVoiceAssistant):
         ])
         
         # Create processing chain
-        def format_docs(docs):
-            return "\n\n".join([doc.page_content for doc in docs])
-        
         def log_and_format_docs(docs):
-            """Log retrieved documents and format them"""
-            if docs:
-                self.logger.info(f"RAG Retrieved {len(docs)} documents:")
-                for i, doc in enumerate(docs, 1):
+            """Log retrieved documents and format them in a single pass"""
+            log_enabled = self.logger.isEnabledFor(logging.INFO)
+            if log_enabled:
+                if docs:
+                    self.logger.info("RAG Retrieved %d documents:", len(docs))
+                else:
+                    self.logger.info("RAG: No documents retrieved")
+            
+            parts = []
+            for i, doc in enumerate(docs, 1):
+                content = doc.page_content
+                parts.append(content)
+                if log_enabled:
                     # Log first 100 characters of each document for reference
-                    content_preview = doc.page_content[:100].replace('\n', ' ').strip()
-                    if len(doc.page_content) > 100:
-                        content_preview += "..."
-                    self.logger.info(f"  Doc {i}: {content_preview}")
-            else:
-                self.logger.info("RAG: No documents retrieved")
-            return format_docs(docs)
-        
-        def get_chat_history(memory):
-            return memory.chat_memory.messages if hasattr(memory, 'chat_memory') else []
+                    self.logger.info(
+                        "  Doc %d: %s%s", i, content[:100].replace('\n', ' ').strip(),
+                        "..." if len(content) > 100 else ""
+                    )
+            return "\n\n".join(parts)
         
         self.rag_chain = (
             {
-                "context": self.retriever | log_and_format_docs,
-                "question": RunnablePassthrough(),
-                "chat_history": lambda x: get_chat_history(self.memory)
+                "context": RunnableLambda(lambda x: self._retrieve(x["question"], x["query_vector"])) | log_and_format_docs,
+                "question": itemgetter("question"),
+                "chat_history": lambda x: list(self.memory)
             }
             | self.prompt
             | self.llm
             | StrOutputParser()
         )
     
-    def process_user_input(self, text):
+    def _retrieve(self, question, query_vector):
         """
-        Process user input through RAG system
+        Retrieve documents for a question, reusing results for repeated queries
         
         Args:
-            text: User input text
+            question: User question text
+            query_vector: Normalized embedding of the question
         
         Returns:
-            Assistant response text
+            List of retrieved documents
+        """
+        # Follow-up questions are searched together with the previous question
+        if self._last_question is not None:
+            key = f"{self._last_question} {question}".casefold().strip()
+        else:
+            key = question.casefold().strip()
+        
+        docs = self._retrieval_cache.get(key)
+        if docs is None:
+            if self._last_query_vector is not None:
+                # Mean of both normalized embeddings stands in for embedding the joined text
+                search_vector = query_vector + self._last_query_vector
+                search_vector /= np.linalg.norm(search_vector)
+            else:
+                search_vector = query_vector
+            
+            docs = self.vectorstore.similarity_search_by_vector(search_vector, k=self._search_k)
+            self._retrieval_cache[key] = docs
+            if len(self._retrieval_cache) > self.RETRIEVAL_CACHE_SIZE:
+                self._retrieval_cache.popitem(last=False)
+        
+        return docs
+    
+    def stream_user_input(self, text):
         """
+        Process user input through RAG system, yielding the response as it is generated
+        
+        Args:
+            text: User input text
+        
+        Yields:
+            Response text fragments
+        """
+        # Check for common responses
+        key = self._common_matcher.find(text)
+        if key:
+            yield self.common_responses[key]
+            return
+        
+        # Skip retrieval and generation for accidental noise
+        if len(text.strip()) < self.MIN_QUERY_LENGTH:
+            yield "Je n'ai pas bien compris. Pouvez-vous préciser votre question ?"
+            return
+        
         try:
-            # Check for common responses
-            text_lower = text.lower()
-            for key, response in self.common_responses.items():
-                if key in text_lower:
-                    return response
+            # Embed the question once for both the response cache and retrieval
+            query_vector = self.embeddings.embed_query(text)
+            
+            # Reuse the answer to a near-identical earlier question
+            cached = self._lookup_response(query_vector)
+            if cached is not None:
+                self.logger.info(f"Response cache hit for query: '{text}'")
+                self._remember_turn(text, query_vector, cached)
+                yield cached
+                return
             
             # Use RAG system for complex queries
             self.logger.info(f"Processing query: '{text}'")
             
-            # Get response from RAG chain
-            response = self.rag_chain.invoke(text)
+            parts = []
+            for token in self.rag_chain.stream({"question": text, "query_vector": query_vector}):
+                parts.append(token)
+                yield token
             
-            # Add to conversation memory
-            self.memory.chat_memory.add_user_message(text)
-            self.memory.chat_memory.add_ai_message(response)
-            
-            self.logger.info(f"Generated response: '{response}'")
-            return response.strip()
+            # Add to conversation memory once the full response is known
+            response = "".join(parts)
+            self._remember_turn(text, query_vector, response)
+            if response.strip():
+                self._store_response(query_vector, response)
             
         except Exception as e:
             self.logger.exception(f"Error processing user input: {e}")
-            return "Désolé, une erreur interne est survenue. Pouvez-vous reformuler votre question ?"
+            yield "Désolé, une erreur interne est survenue. Pouvez-vous reformuler votre question ?"
+            return
+        
+        self.logger.info(f"Generated response: '{response}'")
+    
+    def _remember_turn(self, text, query_vector, response):
+        """Record a completed turn in conversation memory"""
+        self.memory.append(HumanMessage(content=text))
+        self.memory.append(AIMessage(content=response))
+        self._last_question = text
+        self._last_query_vector = query_vector
+    
+    def _lookup_response(self, query_vector):
+        """
+        Find a cached answer for a semantically equivalent question
+        
+        Args:
+            query_vector: Normalized query embedding
+        
+        Returns:
+            Cached response text, or None if no cached question is similar enough
+        """
+        count = len(self._response_texts)
+        if count == 0:
+            return None
+        
+        # One scan over all cached query embeddings
+        best, score = best_match(self._response_vectors[:count], query_vector)
+        if score >= self.RESPONSE_CACHE_THRESHOLD:
+            return self._response_texts[best]
+        return None
+    
+    def _store_response(self, query_vector, response):
+        """Cache a generated answer, overwriting the oldest entry when full"""
+        if self._response_vectors is None:
+            self._response_vectors = np.empty((self.RESPONSE_CACHE_SIZE, len(query_vector)), dtype=np.float32)
+        
+        slot = self._response_next
+        self._response_vectors[slot] = query_vector
+        if slot < len(self._response_texts):
+            self._response_texts[slot] = response
+        else:
+            self._response_texts.append(response)
+        self._response_next = (slot + 1) % self.RESPONSE_CACHE_SIZE
+    
+    def process_user_input(self, text):
+        """
+        Process user input through RAG system
+        
+        Args:
+            text: User input text
+        
+        Returns:
+            Assistant response text
+        """
+        return "".join(self.stream_user_input(text)).strip()
+    
+    def _speak_streamed_response(self, tokens, language="fr_FR", intro_sound=None):
+        """
+        Queue a streamed response for speech sentence by sentence while it is still being generated
+        
+        Args:
+            tokens: Iterable of response text fragments
+            language: TTS language code
+            intro_sound: Sound file played before the first sentence
+        
+        Returns:
+            Full response text
+        """
+        def queue_sentence(sentence):
+            nonlocal first
+            if first and intro_sound:
+                self.play_sound_file_async(intro_sound)
+            first = False
+            self.speak_async(sentence, language)
+        
+        first = True
+        parts = []
+        buffer = ""
+        try:
+            for token in tokens:
+                parts.append(token)
+                print(token, end="", flush=True)
+                
+                # Hand every completed sentence to the TTS worker
+                buffer += token
+                end = 0
+                for match in self.SENTENCE_END.finditer(buffer):
+                    end = match.end()
+                if end:
+                    queue_sentence(buffer[:end])
+                    buffer = buffer[end:]
+            
+            if buffer.strip():
+                queue_sentence(buffer)
+        finally:
+            print()
+        
+        return "".join(parts)
     
     def run_interactive_session(self):
         """Run the main RAG assistant loop"""
@@ -388,23 +1050,17 @@ class RAGAssistant(BaseVoiceAssistant):
                         break
                     
                     # Play thinking sound and show thinking message
-                    thinking_msg = random.choice(self.responses['thinking'])
+                    thinking_msg = next(self._thinking_messages)
                     print(f"Assistant: {thinking_msg}")
-                    self.play_sound_file('model_is_thinking.mp3')
-                    
-                    # Process input through RAG
-                    response = self.process_user_input(transcribed_text)
-                    
-                    print(f"Assistant: {response}")
+                    self.play_sound_file_async('model_is_thinking.mp3')
                     
-                    # Play result sound
-                    self.play_sound_file('result.mp3')
-                    
-                    # Speak response using chunks for long responses
-                    if len(response) > 150:
-                        self.speak_chunks(response, "fr_FR", max_chunk_length=120)
-                    else:
-                        self.speak(response, "fr_FR")
+                    # Process input through RAG, speaking each sentence as soon as it is generated
+                    print("Assistant: ", end="", flush=True)
+                    self._speak_streamed_response(
+                        self.stream_user_input(transcribed_text),
+                        "fr_FR",
+                        intro_sound='result.mp3'
+                    )
                     
                 except KeyboardInterrupt:
                     print("\nSession interrompue par l'utilisateur")
@@ -420,13 +1076,12 @@ class RAGAssistant(BaseVoiceAssistant):
         
         finally:
             print("\nAu revoir!")
+            self.wait_for_speech()
             self.speak("Au revoir et bonne journée !", "fr_FR")
     
     def _is_exit_command(self, text):
         """Check if text contains exit command"""
-        exit_commands = ['quitter', 'sortir', 'arrêter', 'au revoir', 'bye', 'exit', 'quit']
-        text_lower = text.lower()
-        return any(cmd in text_lower for cmd in exit_commands)
+        return self._exit_matcher.find(text) is not None
 
 def main():
     """Main entry point for RAG assistant service"""
@@ -449,13 +1104,42 @@ def main():
         default='small',
         help='Whisper model size (default: small)'
     )
+    parser.add_argument(
+        '--embedding-quant',
+        choices=['int8', 'fp32'],
+        default=RAGAssistant.EMBEDDING_QUANT,
+        help=f'Embedding model precision (default: {RAGAssistant.EMBEDDING_QUANT})'
+    )
+    parser.add_argument(
+        '--embed-batch-size',
+        type=int,
+        default=LocalEmbeddings.ENCODE_BATCH_SIZE,
+        help=f'Chunks encoded per batch when building the vector store (default: {LocalEmbeddings.ENCODE_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--parallel-limit',
+        type=int,
+        default=LocalEmbeddings.PARALLEL_LIMIT,
+        help=f'Embedding batches encoded concurrently (default: {LocalEmbeddings.PARALLEL_LIMIT})'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=RAGAssistant.CHUNK_SIZE,
+        help=f'Knowledge base chunk size in characters when building the vector store; '
+             f'larger chunks give richer context but less specific matches (default: {RAGAssistant.CHUNK_SIZE})'
+    )
     
     args = parser.parse_args()
     
     print("Initializing RAG Assistant Service...")
     
     try:
-        with RAGAssistant(args.doc_path, args.llm_model, args.whisper_model) as service:
+        with RAGAssistant(args.doc_path, args.llm_model, args.whisper_model,
+                          embed_batch_size=args.embed_batch_size,
+                          embedding_quant=args.embedding_quant,
+                          parallel_limit=args.parallel_limit,
+                          chunk_size=args.chunk_size) as service:
             service.run_interactive_session()
     except KeyboardInterrupt:
         print("\nService stopped by user")
@@ -2,13 +2,16 @@
 Translation Service using shared voice assistant modules
 """
 
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add shared modules to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from shared.base.voice_assistant import BaseVoiceAssistant
+from shared.speech.text_processor import KeywordMatcher
 import random
 
 # Translation engine imports
@@ -50,6 +53,15 @@ class TranslationService(BaseVoiceAssistant):
         }
     }
     
+    # Sentence boundary used to translate and speak the first sentence early
+    SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+    
+    # Exit commands per input language of each direction
+    EXIT_COMMANDS = {
+        'en_to_fr': ['quit', 'exit', 'stop', 'goodbye', 'bye'],
+        'fr_to_en': ['quitter', 'sortir', 'arrêter', 'au revoir', 'bye']
+    }
+    
     def __init__(self, direction='en_to_fr', whisper_model='small'):
         """
         Initialize translation service
@@ -63,6 +75,7 @@ class TranslationService(BaseVoiceAssistant):
         
         self.direction = direction
         self.config = self.SUPPORTED_DIRECTIONS[direction]
+        self._exit_matcher = KeywordMatcher(self.EXIT_COMMANDS[direction], whole_words=True)
         
         # Initialize base voice assistant
         super().__init__(f"TranslationService-{direction}", whisper_model)
@@ -71,6 +84,17 @@ class TranslationService(BaseVoiceAssistant):
         if not ARGOSTRANSLATE_AVAILABLE:
             raise RuntimeError("Argos Translate is not available. The service cannot start.")
         
+        # Resolve the installed language pair once instead of on every translation
+        installed = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+        source_lang = installed.get(self.config['input_language'])
+        target_lang = installed.get(self.config['output_language'])
+        self._translator = source_lang.get_translation(target_lang) if source_lang and target_lang else None
+        if self._translator is None:
+            raise RuntimeError(
+                f"Argos Translate package {self.config['input_language']} -> {self.config['output_language']} "
+                f"is not installed. The service cannot start."
+            )
+        
         self.logger.info(f"Translation service initialized for {self.config['direction_display']}")
         
         # Set high sensitivity for better voice detection
@@ -100,11 +124,7 @@ class TranslationService(BaseVoiceAssistant):
             self.logger.info(f"Translating: '{text}' ({self.config['input_language']} -> {self.config['output_language']})")
             
             # Perform translation
-            translated_text = argostranslate.translate.translate(
-                text,
-                self.config['input_language'],
-                self.config['output_language']
-            )
+            translated_text = self._translator.translate(text)
             
             self.logger.info(f"Translation result: '{translated_text}'")
             return translated_text
@@ -113,6 +133,31 @@ class TranslationService(BaseVoiceAssistant):
             self.logger.error(f"Translation failed: {e}")
             return self.translation_error_msg
     
+    def stream_translation(self, text):
+        """
+        Translate text, yielding the first sentence before the rest is finished
+        
+        The remaining sentences are translated in one call (Argos batches them
+        internally) on a background thread while the caller speaks the first one.
+        
+        Args:
+            text: Text to translate
+        
+        Yields:
+            Translated text parts
+        """
+        sentences = self.SENTENCE_SPLIT.split(text.strip())
+        if len(sentences) == 1:
+            yield self.process_user_input(text)
+            return
+        
+        # Translate the first sentence before queuing the rest (the backend runs calls in order)
+        first = self.process_user_input(sentences[0])
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            rest = executor.submit(self.process_user_input, " ".join(sentences[1:]))
+            yield first
+            yield rest.result()
+    
     def run_interactive_session(self):
         """Run the main translation service loop"""
         try:
@@ -147,19 +192,21 @@ class TranslationService(BaseVoiceAssistant):
                     if self._is_exit_command(transcribed_text):
                         break
                     
-                    # Play thinking sound
-                    self.play_sound_file('model_is_thinking.mp3')
-                    
-                    # Translate text
-                    translated_text = self.process_user_input(transcribed_text)
+                    # Play thinking sound while translating
+                    self.play_sound_file_async('model_is_thinking.mp3')
                     
-                    print(f"Translation: {translated_text}")
-                    
-                    # Play result sound
-                    self.play_sound_file('result.mp3')
-                    
-                    # Speak translation result
-                    self.speak(translated_text, self.config['result_voice'])
+                    # Translate text, speaking the first sentence while the rest is translated
+                    for i, translated_text in enumerate(self.stream_translation(transcribed_text)):
+                        if i == 0:
+                            print(f"Translation: {translated_text}")
+                            
+                            # Play result sound
+                            self.play_sound_file_async('result.mp3')
+                        else:
+                            print(f"             {translated_text}")
+                        
+                        # Speak translation result in the background
+                        self.speak_async(translated_text, self.config['result_voice'])
                     
                 except KeyboardInterrupt:
                     print("\nSession interrupted by user")
@@ -175,6 +222,7 @@ class TranslationService(BaseVoiceAssistant):
         
         finally:
             print("\nGoodbye!")
+            self.wait_for_speech()
             if self.direction == 'en_to_fr':
                 self.speak("Goodbye!", self.config['assistant_voice'])
             else:
@@ -182,15 +230,7 @@ class TranslationService(BaseVoiceAssistant):
     
     def _is_exit_command(self, text):
         """Check if text contains exit command"""
-        exit_commands_en = ['quit', 'exit', 'stop', 'goodbye', 'bye']
-        exit_commands_fr = ['quitter', 'sortir', 'arrêter', 'au revoir', 'bye']
-        
-        text_lower = text.lower()
-        
-        if self.direction == 'en_to_fr':
-            return any(cmd in text_lower for cmd in exit_commands_en)
-        else:
-            return any(cmd in text_lower for cmd in exit_commands_fr)
+        return self._exit_matcher.find(text) is not None
 
 def main():
     """Main entry point for translation service"""
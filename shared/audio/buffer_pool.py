@@ -0,0 +1,56 @@
+"""
+Reusable float32 sample buffers for audio conversion
+"""
+
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+# Free buffers kept per capacity; extras are left to the garbage collector
+MAX_BUFFERS_PER_SIZE = 4
+
+_lock = threading.Lock()
+_free_buffers = defaultdict(list)
+
+def _capacity(n):
+    """Round a sample count up to the next power of two so similar lengths share buffers"""
+    return 1 << max(0, int(n) - 1).bit_length()
+
+def acquire(n):
+    """
+    Get a float32 buffer of n samples, reusing a released one when possible
+    
+    Args:
+        n: Number of samples needed
+    
+    Returns:
+        1-D float32 array of length n (contents are undefined)
+    """
+    capacity = _capacity(n)
+    with _lock:
+        free = _free_buffers[capacity]
+        buffer = free.pop() if free else None
+    
+    if buffer is None:
+        buffer = np.empty(capacity, dtype=np.float32)
+    return buffer[:n]
+
+def release(buffer):
+    """
+    Return a buffer obtained from acquire() to the pool
+    
+    The caller must not use the buffer afterwards.
+    
+    Args:
+        buffer: Array returned by acquire()
+    """
+    base = buffer.base if buffer.base is not None else buffer
+    if (not isinstance(base, np.ndarray) or base.dtype != np.float32 or base.ndim != 1
+            or len(base) != _capacity(len(base))):
+        return
+    
+    with _lock:
+        free = _free_buffers[len(base)]
+        if len(free) < MAX_BUFFERS_PER_SIZE:
+            free.append(base)
@@ -2,47 +2,230 @@
 Audio normalization functionality
 """
 
+import os
+import math
+import struct
 import numpy as np
+import soundfile as sf
 import wave
 from pathlib import Path
 from ..config.audio_config import VOLUME_NORM
 
+# Optional multi-threaded JIT kernel for scaling samples
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# WAV fmt chunk format tags accepted for integer PCM data
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def _scale_clip(samples, scale, lo, hi, out):
+    """
+    Scale integer samples into out, saturating at the integer range
+    
+    Args:
+        samples: Integer sample array
+        scale: Gain to apply
+        lo: Smallest representable sample value
+        hi: Largest representable sample value
+        out: Output array with the same length and dtype as samples
+    """
+    for i in prange(samples.shape[0]):
+        value = samples[i] * scale
+        if value < lo:
+            value = lo
+        elif value > hi:
+            value = hi
+        out[i] = value
+
+if NUMBA_AVAILABLE:
+    _scale_clip = njit(parallel=True, fastmath=True, cache=True)(_scale_clip)
+
 class AudioNormalizer:
+    # Samples scaled per block, sized so the float scratch stays in L1/L2
+    NORMALIZE_BLOCK = 32768
+    
+    # Samples per block for the parallel kernel, large enough to split across cores
+    PARALLEL_BLOCK = 1 << 20
+    
+    @staticmethod
+    def calculate_rms(audio_data):
+        """
+        Calculate the RMS level of audio samples
+        
+        16-bit samples are squared and summed exactly in int64 without a
+        converted copy; other formats use a single float32 dot product.
+        
+        Args:
+            audio_data: 1-D numpy array of integer or float samples
+        
+        Returns:
+            RMS value in sample units
+        """
+        if len(audio_data) == 0:
+            return 0.0
+        
+        if audio_data.dtype == np.int16:
+            sum_squares = np.einsum('i,i->', audio_data, audio_data, dtype=np.int64)
+            return math.sqrt(int(sum_squares) / len(audio_data))
+        
+        samples = audio_data if audio_data.dtype == np.float32 else audio_data.astype(np.float32)
+        return float(np.sqrt(np.dot(samples, samples) / len(samples)))
+    
+    @staticmethod
+    def normalize_array(audio, target_volume=VOLUME_NORM):
+        """
+        Normalize float32 samples in place to the target RMS level
+        
+        Args:
+            audio: 1-D float32 numpy array of samples in [-1, 1]
+            target_volume: Target RMS as a fraction of full scale
+        
+        Returns:
+            The same array, scaled and clipped to [-1, 1]
+        """
+        current_volume = AudioNormalizer.calculate_rms(audio)
+        if current_volume == 0:
+            print("Audio appears to be silent, skipping normalization")
+            return audio
+        
+        scaling_factor = target_volume / current_volume
+        if not 0.95 < scaling_factor < 1.05:
+            if NUMBA_AVAILABLE:
+                # Scale and clip in one fused pass over the buffer
+                _scale_clip(audio, float(scaling_factor), -1.0, 1.0, audio)
+            else:
+                np.multiply(audio, np.float32(scaling_factor), out=audio)
+                np.clip(audio, -1.0, 1.0, out=audio)
+        return audio
+    
+    @staticmethod
+    def load_normalized(audio_path, sample_rate=16000, target_volume=VOLUME_NORM):
+        """
+        Read a WAV file into memory and normalize the samples there
+        
+        Unlike normalize_audio, the file itself is left untouched.
+        
+        Args:
+            audio_path: Path to an audio file
+            sample_rate: Required sample rate of the file
+            target_volume: Target RMS as a fraction of full scale
+        
+        Returns:
+            Normalized mono float32 samples, or None if the file is not at
+            sample_rate or libsndfile cannot read it
+        """
+        try:
+            if sf.info(str(audio_path)).samplerate != sample_rate:
+                return None
+            audio, _ = sf.read(str(audio_path), dtype='float32', always_2d=True)
+        except RuntimeError as e:  # soundfile.LibsndfileError, e.g. m4a or mp3 on older libsndfile
+            print(f"Cannot read {audio_path} with soundfile: {e}")
+            return None
+        
+        if audio.shape[1] == 1:
+            audio = audio[:, 0]
+        else:
+            audio = audio.mean(axis=1, dtype=np.float32)
+        
+        return AudioNormalizer.normalize_array(np.ascontiguousarray(audio), target_volume)
+    
+    @staticmethod
+    def read_wav_layout(audio_path):
+        """
+        Locate the PCM sample data in a WAV file by walking its RIFF chunks
+        
+        Args:
+            audio_path: Path to a PCM WAV file
+        
+        Returns:
+            Tuple of (channels, framerate, sample_width, data_offset, data_size)
+        """
+        file_size = os.path.getsize(audio_path)
+        with open(audio_path, 'rb') as f:
+            riff_id, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+            if riff_id != b'RIFF' or wave_id != b'WAVE':
+                raise ValueError("Not a RIFF/WAVE file")
+            
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    raise ValueError("No data chunk found")
+                chunk_id, chunk_size = struct.unpack('<4sI', header)
+                
+                if chunk_id == b'fmt ':
+                    fmt = struct.unpack('<HHIIHH', f.read(16))
+                    f.seek(chunk_size - 16 + (chunk_size & 1), 1)
+                elif chunk_id == b'data':
+                    if fmt is None:
+                        raise ValueError("data chunk before fmt chunk")
+                    format_tag, channels, framerate, _, _, bits = fmt
+                    if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE):
+                        raise ValueError(f"Unsupported WAV format tag: {format_tag}")
+                    data_offset = f.tell()
+                    # Streaming writers may leave a placeholder size; trust the file length
+                    data_size = min(chunk_size, file_size - data_offset)
+                    return channels, framerate, bits // 8, data_offset, data_size
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), 1)
+    
     @staticmethod
     def normalize_audio(audio_path, target_volume=VOLUME_NORM):
         """Normalize audio volume to target level"""
         try:
-            with wave.open(str(audio_path), 'rb') as wf:
-                frames = wf.readframes(wf.getnframes())
-                sample_width = wf.getsampwidth()
-                framerate = wf.getframerate()
-                channels = wf.getnchannels()
+            audio_path = Path(audio_path)
+            channels, framerate, sample_width, data_offset, data_size = \
+                AudioNormalizer.read_wav_layout(audio_path)
             
-            # Convert to numpy array
+            # Map the samples straight from the file instead of reading them into memory
             if sample_width == 2:  # 16-bit
-                audio_data = np.frombuffer(frames, dtype=np.int16)
+                dtype = np.int16
             elif sample_width == 4:  # 32-bit
-                audio_data = np.frombuffer(frames, dtype=np.int32)
+                dtype = np.int32
             else:
                 print(f"Unsupported sample width: {sample_width}")
                 return False
             
+            n_samples = data_size // sample_width
+            if n_samples == 0:
+                print("Audio appears to be silent, skipping normalization")
+                return False
+            audio_data = np.memmap(audio_path, dtype=dtype, mode='r',
+                                   offset=data_offset, shape=(n_samples,))
+            
             # Calculate current volume (RMS)
-            current_volume = np.sqrt(np.mean(audio_data.astype(float) ** 2))
+            current_volume = AudioNormalizer.calculate_rms(audio_data)
             
             if current_volume > 0:
                 # Normalize to target volume
-                max_val = np.iinfo(audio_data.dtype).max
-                target_rms = target_volume * max_val
+                limits = np.iinfo(dtype)
+                target_rms = target_volume * limits.max
                 scaling_factor = target_rms / current_volume
-                normalized_audio = (audio_data * scaling_factor).astype(audio_data.dtype)
                 
-                # Save normalized audio
-                with wave.open(str(audio_path), 'wb') as wf:
-                    wf.setnchannels(channels)
-                    wf.setsampwidth(sample_width)
-                    wf.setframerate(framerate)
-                    wf.writeframes(normalized_audio.tobytes())
+                # Already within 5% of the target: leave the file untouched
+                if 0.95 < scaling_factor < 1.05:
+                    return True
+                
+                # Scale and save through a buffered temp file, then swap it in atomically
+                tmp_path = audio_path.with_suffix('.norm.wav')
+                try:
+                    with open(tmp_path, 'wb', buffering=1 << 20) as f, wave.open(f, 'wb') as wf:
+                        wf.setnchannels(channels)
+                        wf.setsampwidth(sample_width)
+                        wf.setframerate(framerate)
+                        AudioNormalizer._write_scaled(wf, audio_data, scaling_factor)
+                    
+                    # Release the mapping before replacing the file it maps
+                    del audio_data
+                    os.replace(tmp_path, audio_path)
+                finally:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
                 
                 return True
             else:
@@ -51,4 +234,44 @@ class AudioNormalizer:
                 
         except Exception as e:
             print(f"Error normalizing audio: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def _write_scaled(wf, audio_data, scaling_factor):
+        """
+        Scale samples block by block and write each block to an open WAV file
+        
+        Args:
+            wf: Wave writer with its parameters already set
+            audio_data: Integer sample array (may be a read-only memmap)
+            scaling_factor: Gain to apply
+        """
+        limits = np.iinfo(audio_data.dtype)
+        
+        if NUMBA_AVAILABLE:
+            # Compiled kernel spreads each block across cores without holding the GIL
+            block_size = min(len(audio_data), AudioNormalizer.PARALLEL_BLOCK)
+            output = np.empty(block_size, dtype=audio_data.dtype)
+            for start in range(0, len(audio_data), block_size):
+                block = np.asarray(audio_data[start:start + block_size])
+                out_block = output[:len(block)]
+                _scale_clip(block, float(scaling_factor), float(limits.min), float(limits.max), out_block)
+                wf.writeframes(out_block)
+            return
+        
+        # Reused float scratch (float32 is exact for 16-bit samples) and output block;
+        # samples are clipped before the cast back so loud peaks saturate
+        block_size = min(len(audio_data), AudioNormalizer.NORMALIZE_BLOCK)
+        scratch_dtype = np.float32 if audio_data.dtype.itemsize == 2 else np.float64
+        scratch = np.empty(block_size, dtype=scratch_dtype)
+        output = np.empty(block_size, dtype=audio_data.dtype)
+        scale = scratch_dtype(scaling_factor)
+        
+        for start in range(0, len(audio_data), block_size):
+            block = audio_data[start:start + block_size]
+            scaled = scratch[:len(block)]
+            np.multiply(block, scale, out=scaled)
+            np.clip(scaled, limits.min, limits.max, out=scaled)
+            out_block = output[:len(block)]
+            out_block[:] = scaled
+            wf.writeframes(out_block)
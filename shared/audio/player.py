@@ -3,6 +3,7 @@ Cross-platform audio playback functionality
 """
 
 import sys
+import threading
 from pathlib import Path
 
 # Import platform-specific audio libraries
@@ -19,14 +20,177 @@ try:
 except ImportError:
     WINSOUND_AVAILABLE = False
 
+# Raw PCM output for audio that is streamed rather than read from a file
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
 class AudioPlayer:
+    # File types decoded into the sound cache by preload()
+    PRELOAD_SUFFIXES = ('.wav', '.mp3', '.ogg')
+    
     def __init__(self):
         self.pygame_available = PYGAME_AVAILABLE
         self.winsound_available = WINSOUND_AVAILABLE
+        self.pcm_stream_available = PYAUDIO_AVAILABLE
+        
+        # Decoded short sounds keyed by file name, ready for immediate playback
+        self._sound_cache = {}
+        
+        # PyAudio instance and output stream reused across streamed playbacks
+        self._pa = None
+        self._pcm_stream = None
+        self._pcm_format = None
+        self._pcm_lock = threading.Lock()
         
         if not (self.pygame_available or self.winsound_available):
             print("Warning: No audio playback library available")
     
+    def preload(self, sounds_dir):
+        """
+        Decode every sound file in a directory once and keep it in memory
+        
+        Args:
+            sounds_dir: Directory of short WAV, MP3 or OGG sound effects
+        
+        Returns:
+            Number of sounds cached
+        """
+        sounds_dir = Path(sounds_dir)
+        if not self.pygame_available or not sounds_dir.is_dir():
+            return 0
+        
+        for sound_path in sounds_dir.iterdir():
+            if sound_path.suffix.lower() not in self.PRELOAD_SUFFIXES:
+                continue
+            try:
+                self._sound_cache[sound_path.name] = pygame.mixer.Sound(str(sound_path))
+            except Exception as e:
+                print(f"Could not preload sound {sound_path.name}: {e}")
+        
+        return len(self._sound_cache)
+    
+    def has_sound(self, name):
+        """Check whether a sound file name was preloaded"""
+        return name in self._sound_cache
+    
+    def play_cached(self, name):
+        """
+        Play a preloaded sound without touching the disk or decoder
+        
+        Args:
+            name: File name passed to preload() (e.g., 'result.mp3')
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        sound = self._sound_cache.get(name)
+        if sound is None:
+            print(f"Sound not preloaded: {name}")
+            return False
+        
+        try:
+            self._play_sound(sound)
+            return True
+        except Exception as e:
+            print(f"Error playing sound: {e}")
+            return False
+    
+    @staticmethod
+    def _play_sound(sound):
+        """
+        Play a pygame Sound and block until it has finished
+        
+        Sleeps once for the clip length instead of polling the mixer every
+        100 ms, so playback returns as soon as the clip ends.
+        
+        Args:
+            sound: pygame.mixer.Sound to play
+        """
+        channel = sound.play()
+        pygame.time.wait(int(sound.get_length() * 1000))
+        
+        # Cover any mixer buffer still draining after the nominal length
+        while channel is not None and channel.get_busy():
+            pygame.time.wait(5)
+    
+    @staticmethod
+    def _play_with_pygame(audio_path):
+        """
+        Decode an audio file with pygame and block until it has finished playing
+        
+        Args:
+            audio_path: Path to a WAV, MP3 or OGG file
+        """
+        AudioPlayer._play_sound(pygame.mixer.Sound(str(audio_path)))
+    
+    def play_pcm_stream(self, chunks, sample_rate, channels=1):
+        """
+        Play 16-bit PCM as it arrives, blocking until the last chunk has played
+        
+        Args:
+            chunks: Iterable of raw little-endian int16 byte chunks
+            sample_rate: Sample rate of the audio in Hz
+            channels: Number of interleaved channels
+        
+        Returns:
+            True if any audio was played (including a stream that failed partway,
+            so callers do not replay its start), False otherwise
+        """
+        if not self.pcm_stream_available:
+            print("Streaming playback requires pyaudio")
+            return False
+        
+        with self._pcm_lock:
+            written = False
+            try:
+                stream = self._get_pcm_stream(sample_rate, channels)
+                if stream.is_stopped():
+                    stream.start_stream()
+                for chunk in chunks:
+                    stream.write(chunk)
+                    written = True
+                stream.stop_stream()
+                return True
+                
+            except Exception as e:
+                print(f"Error streaming audio: {e}")
+                self._close_pcm_stream()
+                return written
+    
+    def _get_pcm_stream(self, sample_rate, channels):
+        """Return the open output stream, reopening it if the format changed"""
+        if self._pcm_stream is not None and self._pcm_format != (sample_rate, channels):
+            self._close_pcm_stream()
+        
+        if self._pcm_stream is None:
+            if self._pa is None:
+                self._pa = pyaudio.PyAudio()
+            self._pcm_stream = self._pa.open(format=pyaudio.paInt16, channels=channels, rate=sample_rate, output=True)
+            self._pcm_format = (sample_rate, channels)
+        
+        return self._pcm_stream
+    
+    def _close_pcm_stream(self):
+        """Close the output stream, keeping the PyAudio instance"""
+        if self._pcm_stream is not None:
+            try:
+                self._pcm_stream.close()
+            except Exception:
+                pass
+        self._pcm_stream = None
+        self._pcm_format = None
+    
+    def close(self):
+        """Release the streaming output device"""
+        with self._pcm_lock:
+            self._close_pcm_stream()
+            if self._pa is not None:
+                self._pa.terminate()
+                self._pa = None
+    
     def play_wav(self, wav_path):
         """Play WAV file using available audio library"""
         wav_path = Path(wav_path)
@@ -43,12 +207,7 @@ class AudioPlayer:
             
             # Fall back to pygame (cross-platform)
             elif self.pygame_available:
-                pygame.mixer.music.load(str(wav_path))
-                pygame.mixer.music.play()
-                
-                # Wait for playback to complete
-                while pygame.mixer.music.get_busy():
-                    pygame.time.wait(100)
+                self._play_with_pygame(wav_path)
                 return True
             
             else:
@@ -72,12 +231,7 @@ class AudioPlayer:
             return False
             
         try:
-            pygame.mixer.music.load(str(mp3_path))
-            pygame.mixer.music.play()
-            
-            # Wait for playback to complete
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
+            self._play_with_pygame(mp3_path)
             return True
             
         except Exception as e:
@@ -2,15 +2,101 @@
 Real-time audio recording with intelligent silence detection
 """
 
+import io
+import math
+import queue
 import pyaudio
 import numpy as np
-import wave
 import tempfile
-import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from collections import deque
 from ..config.audio_config import *
+from .normalizer import AudioNormalizer
+from .recorder import pcm_to_float32, write_wav
+
+# Optional JIT compilation of the per-chunk speech detection
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 1 / 32768^2: maps an int16 mean square onto the 0-1 volume range
+INT16_MEAN_SQUARE_SCALE = 1.0 / 32768.0 ** 2
+
+# Recent chunk volumes kept for the ambient noise estimate
+AMBIENT_WINDOW = 20
+
+# EMA weight of the newest chunk volume; the smoothed level falls below the
+# quiet-speech threshold within ~20 chunks of silence, sooner than the previous
+# 50-chunk weighted average cleared, so end of speech is not detected later
+SMOOTHING_ALPHA = 0.2
+
+def _detect_speech(levels, count, smoothed, volume, silence_threshold):
+    """
+    Record a chunk volume in the level history and decide whether it is speech
+    
+    Args:
+        levels: Ring buffer of recent chunk volumes (float32 array of AMBIENT_WINDOW)
+        count: Number of volumes recorded so far
+        smoothed: Smoothed volume after the previous chunk
+        volume: Volume of the current chunk
+        silence_threshold: Base silence threshold
+    
+    Returns:
+        Tuple of (smoothed volume, speech detected)
+    """
+    size = levels.shape[0]
+    levels[count % size] = volume
+    count += 1
+    
+    # Exponential moving average (raw volume for the first few chunks)
+    if count < 5:
+        smoothed = volume
+    else:
+        smoothed += SMOOTHING_ALPHA * (volume - smoothed)
+    
+    # Dynamic threshold adjustment based on ambient noise (last 20 chunks)
+    adjusted_threshold = silence_threshold
+    if count > size:
+        # 10th percentile of 20 levels (linear interpolation between the 2nd and
+        # 3rd smallest), found with a single pass over the three smallest values
+        first = second = third = np.inf
+        for k in range(size):
+            level = levels[k]
+            if level < first:
+                first, second, third = level, first, second
+            elif level < second:
+                second, third = level, second
+            elif level < third:
+                third = level
+        ambient_level = second + 0.9 * (third - second)  # Lower percentile for better sensitivity
+        # Use more conservative multiplier to avoid being too aggressive
+        adjusted_threshold = max(silence_threshold, ambient_level * 1.2)
+    
+    # Additional sensitivity boost for quiet voices
+    if smoothed > silence_threshold * 0.5:  # Even very quiet speech
+        return smoothed, True
+    
+    return smoothed, smoothed > adjusted_threshold
+
+if NUMBA_AVAILABLE:
+    _detect_speech = njit(cache=True, fastmath=True)(_detect_speech)
+
+def _int16_volume(audio_data):
+    """Calculate RMS volume (0-1) of a chunk of 16-bit samples"""
+    if len(audio_data) == 0:
+        return 0.0
+    
+    # Exact integer sum of squares, scaled to the 0-1 range under a single sqrt
+    samples = np.frombuffer(audio_data, dtype=np.int16)
+    sum_squares = int(np.einsum('i,i->', samples, samples, dtype=np.int64))
+    return math.sqrt(sum_squares * INT16_MEAN_SQUARE_SCALE / len(samples))
+
+def _float32_volume(audio_data):
+    """Calculate RMS volume of a chunk of float32 samples"""
+    return AudioNormalizer.calculate_rms(np.frombuffer(audio_data, dtype=np.float32))
 
 class RealTimeRecorder:
     def __init__(self, silence_threshold=0.005, silence_duration=2.0, min_recording_time=0.5):
@@ -30,109 +116,120 @@ class RealTimeRecorder:
         self.silence_duration = silence_duration
         self.min_recording_time = min_recording_time
         
+        # Volume calculation specialized once for the fixed sample format
+        if self.audio_format == pyaudio.paInt16:
+            self._calculate_volume = _int16_volume
+        else:
+            self._calculate_volume = _float32_volume
+        
         # Recording state
         self.is_recording = False
-        self.audio_frames = []
-        self.silence_start = None
+        self.audio_buffer = io.BytesIO()
+        self.frames_recorded = 0
+        self.silent_frames = 0
         self.recording_start = None
         
-        # Audio level monitoring
-        self.audio_levels = deque(maxlen=50)  # Keep last 50 chunks for smoothing
-        
-        # Get sample width
-        pa = pyaudio.PyAudio()
-        try:
-            self.sample_width = pa.get_sample_size(self.audio_format)
-        finally:
-            pa.terminate()
-    
-    def _calculate_volume(self, audio_data):
-        """Calculate RMS volume of audio data"""
-        if len(audio_data) == 0:
-            return 0.0
-        
-        # Convert to numpy array
-        if self.audio_format == pyaudio.paInt16:
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-        else:
-            audio_array = np.frombuffer(audio_data, dtype=np.float32)
+        # Audio level monitoring: smoothed volume plus a ring buffer of recent
+        # chunk volumes for the ambient noise estimate
+        self.audio_levels = np.zeros(AMBIENT_WINDOW, dtype=np.float32)
+        self.audio_level_count = 0
+        self.smoothed_volume = 0.0
         
-        # Calculate RMS
-        rms = np.sqrt(np.mean(audio_array.astype(float) ** 2))
+        # PortAudio is initialized once; the input stream is opened on first record
+        self._pa = pyaudio.PyAudio()
+        self._stream = None
+        self.sample_width = self._pa.get_sample_size(self.audio_format)
         
-        # Normalize to 0-1 range
-        if self.audio_format == pyaudio.paInt16:
-            rms = rms / 32768.0
+        # Chunks captured by the PortAudio callback, drained by the recording loop
+        self._chunks = queue.Queue()
         
-        return rms
+        # Single reusable worker thread for background recordings
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recorder")
     
-    def _get_smoothed_volume(self, current_volume):
-        """Get smoothed volume using recent history"""
-        self.audio_levels.append(current_volume)
-        
-        if len(self.audio_levels) < 5:
-            return current_volume
-        
-        # Use weighted average with more weight on recent samples
-        weights = np.exp(np.linspace(-1, 0, len(self.audio_levels)))
-        smoothed = np.average(self.audio_levels, weights=weights)
-        
-        return smoothed
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: hand the captured chunk to the recording loop"""
+        self._chunks.put(in_data)
+        return (None, pyaudio.paContinue)
+    
+    def _start_stream(self):
+        """Open the input stream on first use, or restart the one left open"""
+        if self._stream is None:
+            self._stream = self._pa.open(
+                format=self.audio_format,
+                channels=self.channels,
+                rate=self.rate,
+                input=True,
+                frames_per_buffer=self.chunk,
+                stream_callback=self._on_audio
+            )
+        elif self._stream.is_stopped():
+            self._stream.start_stream()
+        return self._stream
+    
+    def _stop_stream(self):
+        """Pause the input stream between recordings without closing it"""
+        if self._stream is not None and not self._stream.is_stopped():
+            self._stream.stop_stream()
+    
+    def close(self):
+        """Close the input stream and release PortAudio"""
+        self._background.shutdown(wait=True)
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def _is_speech_detected(self, volume):
         """Detect if current audio contains speech"""
-        smoothed_volume = self._get_smoothed_volume(volume)
-        
-        # Dynamic threshold adjustment based on ambient noise
-        if len(self.audio_levels) > 20:
-            ambient_level = np.percentile(list(self.audio_levels)[-20:], 10)  # Lower percentile for better sensitivity
-            # Use more conservative multiplier to avoid being too aggressive
-            adjusted_threshold = max(self.silence_threshold, ambient_level * 1.2)
-        else:
-            adjusted_threshold = self.silence_threshold
-        
-        # Additional sensitivity boost for quiet voices
-        if smoothed_volume > self.silence_threshold * 0.5:  # Even very quiet speech
-            return True
-        
-        return smoothed_volume > adjusted_threshold
+        self.smoothed_volume, has_speech = _detect_speech(
+            self.audio_levels, self.audio_level_count, self.smoothed_volume,
+            volume, self.silence_threshold
+        )
+        self.audio_level_count += 1
+        return has_speech
     
-    def record_with_silence_detection(self, temp_dir=None, max_duration=30.0, 
-                                    volume_callback=None, speech_callback=None):
+    def _capture_until_silence(self, max_duration, volume_callback, speech_callback,
+                               segment_callback=None, segment_seconds=1.0):
         """
-        Record audio with intelligent silence detection
+        Capture microphone audio into self.audio_buffer until speech ends
         
         Args:
-            temp_dir: Directory for temporary files
             max_duration: Maximum recording duration in seconds
             volume_callback: Callback function for volume updates
             speech_callback: Callback function for speech detection events
+            segment_callback: Called with float32 samples of each newly recorded segment
+            segment_seconds: Length of the segments passed to segment_callback
         
         Returns:
-            Path to recorded audio file, or None if no speech detected
+            True if speech was recorded, False otherwise
         """
-        if temp_dir is None:
-            temp_dir = Path(tempfile.gettempdir())
-        
-        temp_audio_path = temp_dir / "realtime_audio.wav"
+        # Recorded audio not yet handed to segment_callback
+        pending = bytearray()
+        segment_bytes = int(segment_seconds * self.rate) * self.channels * self.sample_width
         
-        pa = pyaudio.PyAudio()
+        # Silence is measured in consecutive quiet chunks rather than wall-clock time
+        silence_frames = max(1, math.ceil(self.silence_duration * self.rate / self.chunk))
         
         try:
-            stream = pa.open(
-                format=self.audio_format,
-                channels=self.channels,
-                rate=self.rate,
-                input=True,
-                frames_per_buffer=self.chunk
-            )
+            # Drop chunks left over from the previous recording
+            self._chunks = queue.Queue()
+            self._start_stream()
             
             print("🎤 Listening... (speak now)")
             if speech_callback:
                 speech_callback("listening")
             
-            self.audio_frames = []
-            self.silence_start = None
+            self.audio_buffer = io.BytesIO()
+            self.frames_recorded = 0
+            self.silent_frames = 0
             self.recording_start = time.time()
             self.is_recording = False
             speech_detected = False
@@ -147,8 +244,8 @@ class RealTimeRecorder:
                     break
                 
                 try:
-                    # Read audio chunk
-                    data = stream.read(self.chunk, exception_on_overflow=False)
+                    # Wait for the next chunk captured by the stream callback
+                    data = self._chunks.get(timeout=1.0)
                     volume = self._calculate_volume(data)
                     
                     # Update volume callback
@@ -158,94 +255,135 @@ class RealTimeRecorder:
                     # Check for speech
                     has_speech = self._is_speech_detected(volume)
                     
-                    if has_speech:
-                        # Speech detected
-                        if not self.is_recording:
-                            print("🗣️  Speech detected - Recording started")
-                            if speech_callback:
-                                speech_callback("recording")
-                            self.is_recording = True
-                            speech_detected = True
-                        
-                        # Reset silence timer
-                        self.silence_start = None
-                        self.audio_frames.append(data)
-                        
-                    else:
-                        # Silence detected
-                        if self.is_recording:
-                            # We're recording but now have silence
-                            if self.silence_start is None:
-                                self.silence_start = current_time
-                            
-                            silence_duration = current_time - self.silence_start
-                            
-                            # Continue recording during brief silence
-                            self.audio_frames.append(data)
-                            
-                            # Check if silence duration exceeded threshold
-                            recording_duration = elapsed_time
-                            if (silence_duration >= self.silence_duration and 
-                                recording_duration >= self.min_recording_time):
-                                print("🤫 Silence detected - Recording stopped")
-                                if speech_callback:
-                                    speech_callback("stopped")
-                                break
+                    if has_speech and not self.is_recording:
+                        print("🗣️  Speech detected - Recording started")
+                        if speech_callback:
+                            speech_callback("recording")
+                        self.is_recording = True
+                        speech_detected = True
+                    
+                    if self.is_recording:
+                        # Keep recording through brief pauses; speech resets the silence run
+                        self.silent_frames = 0 if has_speech else self.silent_frames + 1
+                        self.audio_buffer.write(data)
+                        self.frames_recorded += 1
+                        if segment_callback:
+                            pending += data
                         
-                        else:
-                            # Not recording and still silence - just waiting
-                            if not speech_detected and elapsed_time > 10.0:
-                                print("⏳ No speech detected in 10 seconds")
-                                break
+                        # Check if silence duration exceeded threshold
+                        if (self.silent_frames >= silence_frames and
+                            elapsed_time >= self.min_recording_time):
+                            print("🤫 Silence detected - Recording stopped")
+                            if speech_callback:
+                                speech_callback("stopped")
+                            break
+                    
+                    elif elapsed_time > 10.0:
+                        # Not recording and still silence - just waiting
+                        print("⏳ No speech detected in 10 seconds")
+                        break
                 
-                except OSError as e:
-                    # Handle audio buffer overflow
-                    print(f"Audio buffer overflow: {e}")
+                except queue.Empty:
+                    # No audio delivered yet; re-check the duration limits
                     continue
+                
+                # Hand each completed segment to the consumer while recording continues
+                if segment_callback and len(pending) >= segment_bytes:
+                    segment_callback(pcm_to_float32(pending, self.audio_format, self.channels))
+                    pending = bytearray()
             
-            stream.stop_stream()
-            stream.close()
-            
-            # Check if we have recorded audio
-            if not speech_detected or len(self.audio_frames) == 0:
-                print("❌ No speech recorded")
+        finally:
+            self._stop_stream()
+        
+        # Check if we have recorded audio
+        if not speech_detected or self.frames_recorded == 0:
+            print("❌ No speech recorded")
+            return False
+        
+        recording_duration = self.frames_recorded * self.chunk / self.rate
+        print(f"✅ Recording completed: {recording_duration:.2f}s")
+        return True
+    
+    def record_with_silence_detection(self, temp_dir=None, max_duration=30.0, 
+                                    volume_callback=None, speech_callback=None):
+        """
+        Record audio with intelligent silence detection
+        
+        Args:
+            temp_dir: Directory for temporary files
+            max_duration: Maximum recording duration in seconds
+            volume_callback: Callback function for volume updates
+            speech_callback: Callback function for speech detection events
+        
+        Returns:
+            Path to recorded audio file, or None if no speech detected
+        """
+        if temp_dir is None:
+            temp_dir = Path(tempfile.gettempdir())
+        
+        temp_audio_path = temp_dir / "realtime_audio.wav"
+        
+        try:
+            if not self._capture_until_silence(max_duration, volume_callback, speech_callback):
                 return None
             
-            # Save recorded audio
-            with wave.open(str(temp_audio_path), 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.sample_width)
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(self.audio_frames))
-            
-            recording_duration = len(self.audio_frames) * self.chunk / self.rate
-            print(f"✅ Recording completed: {recording_duration:.2f}s")
+            # Save recorded audio straight from the buffer (libsndfile writes without the GIL)
+            with self.audio_buffer.getbuffer() as pcm:
+                write_wav(temp_audio_path, pcm, self.audio_format, self.channels, self.rate)
             
             return temp_audio_path
             
         except Exception as e:
             print(f"Recording error: {e}")
             return None
+    
+    def record_array_with_silence_detection(self, max_duration=30.0, volume_callback=None,
+                                            speech_callback=None, segment_callback=None,
+                                            segment_seconds=1.0):
+        """
+        Record audio with intelligent silence detection, keeping it in memory
+        
+        Args:
+            max_duration: Maximum recording duration in seconds
+            volume_callback: Callback function for volume updates
+            speech_callback: Callback function for speech detection events
+            segment_callback: Called during recording with float32 samples of each
+                new segment (from buffer_pool; the callee owns and releases them)
+            segment_seconds: Length of the segments passed to segment_callback
+        
+        Returns:
+            Mono float32 samples in [-1, 1] at self.rate, or None if no speech detected
+        """
+        try:
+            if not self._capture_until_silence(max_duration, volume_callback, speech_callback,
+                                               segment_callback, segment_seconds):
+                return None
             
-        finally:
-            pa.terminate()
+            with self.audio_buffer.getbuffer() as pcm:
+                return pcm_to_float32(pcm, self.audio_format, self.channels)
+            
+        except Exception as e:
+            print(f"Recording error: {e}")
+            return None
     
     def start_background_recording(self, temp_dir=None, result_callback=None):
         """
-        Start recording in background thread with callback
+        Start recording on the background worker thread with callback
         
         Args:
             temp_dir: Directory for temporary files
             result_callback: Function to call with recording result
+        
+        Returns:
+            Future resolving to the recorded audio path (or None)
         """
-        def recording_thread():
+        def recording_job():
             result = self.record_with_silence_detection(temp_dir)
             if result_callback:
                 result_callback(result)
+            return result
         
-        thread = threading.Thread(target=recording_thread, daemon=True)
-        thread.start()
-        return thread
+        return self._background.submit(recording_job)
     
     def get_recording_stats(self):
         """Get current recording statistics"""
@@ -254,11 +392,11 @@ class RealTimeRecorder:
         
         current_time = time.time()
         recording_duration = current_time - self.recording_start if self.recording_start else 0
-        silence_duration = current_time - self.silence_start if self.silence_start else 0
+        silence_duration = self.silent_frames * self.chunk / self.rate
         
         return {
             'recording_duration': recording_duration,
             'silence_duration': silence_duration,
-            'frames_recorded': len(self.audio_frames),
+            'frames_recorded': self.frames_recorded,
             'is_recording': self.is_recording
         }
\ No newline at end of file
@@ -4,10 +4,68 @@ Audio recording functionality shared across services
 
 import pyaudio
 import numpy as np
-import wave
-import tempfile
-from pathlib import Path
+import soundfile as sf
 from ..config.audio_config import *
+from . import buffer_pool
+
+# Sample dtype and libsndfile subtype for each supported PyAudio format
+PCM_FORMATS = {
+    pyaudio.paInt16: (np.int16, 'PCM_16'),
+    pyaudio.paInt32: (np.int32, 'PCM_32'),
+    pyaudio.paFloat32: (np.float32, 'FLOAT'),
+}
+
+def write_wav(path, pcm, audio_format, channels, rate):
+    """
+    Write raw interleaved PCM bytes to a WAV file with libsndfile
+    
+    The samples are passed to libsndfile as a zero-copy numpy view, and the
+    write runs in C without holding the GIL.
+    
+    Args:
+        path: Output WAV file path
+        pcm: Bytes-like buffer of interleaved samples
+        audio_format: PyAudio sample format of the samples
+        channels: Number of interleaved channels
+        rate: Sample rate in Hz
+    """
+    if audio_format not in PCM_FORMATS:
+        raise ValueError(f"Unsupported audio format: {audio_format}")
+    
+    dtype, subtype = PCM_FORMATS[audio_format]
+    samples = np.frombuffer(pcm, dtype=dtype).reshape(-1, channels)
+    sf.write(str(path), samples, rate, subtype=subtype)
+
+def pcm_to_float32(pcm, audio_format, channels):
+    """
+    Convert raw interleaved PCM bytes to mono float32 samples in [-1, 1]
+    
+    This is the in-memory format Whisper accepts directly, so recordings can be
+    transcribed without a WAV file round-trip.
+    
+    Args:
+        pcm: Bytes-like buffer of interleaved samples
+        audio_format: PyAudio sample format of the samples
+        channels: Number of interleaved channels
+    
+    Returns:
+        1-D float32 numpy array from buffer_pool (does not reference pcm);
+        the owner may hand it back with buffer_pool.release() once done
+    """
+    if audio_format not in PCM_FORMATS:
+        raise ValueError(f"Unsupported audio format: {audio_format}")
+    
+    dtype, _ = PCM_FORMATS[audio_format]
+    samples = np.frombuffer(pcm, dtype=dtype)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    
+    audio = buffer_pool.acquire(len(samples))
+    if np.issubdtype(dtype, np.integer):
+        np.multiply(samples, 1.0 / (np.iinfo(dtype).max + 1), out=audio)
+    else:
+        np.copyto(audio, samples)
+    return audio
 
 class AudioRecorder:
     def __init__(self):
@@ -18,51 +76,70 @@ class AudioRecorder:
         self.record_seconds = RECORD_SECONDS
         self.silence_threshold = SILENCE_THRESHOLD
         
-        pa = pyaudio.PyAudio()
-        try:
-            self.sample_width = pa.get_sample_size(self.audio_format)
-        finally:
-            pa.terminate()
+        # PortAudio is initialized once; the input stream is opened on first record
+        self._pa = pyaudio.PyAudio()
+        self._stream = None
+        self.sample_width = self._pa.get_sample_size(self.audio_format)
     
-    def record_audio(self, temp_dir=None):
-        """Record audio from microphone and return the file path"""
-        if temp_dir is None:
-            temp_dir = Path(tempfile.gettempdir())
-        
-        temp_audio_path = temp_dir / "temp_audio.wav"
-        
-        pa = pyaudio.PyAudio()
-        
-        try:
-            stream = pa.open(
+    def _start_stream(self):
+        """Open the input stream on first use, or restart the one left open"""
+        if self._stream is None:
+            self._stream = self._pa.open(
                 format=self.audio_format,
                 channels=self.channels,
                 rate=self.rate,
                 input=True,
                 frames_per_buffer=self.chunk
             )
+        elif self._stream.is_stopped():
+            self._stream.start_stream()
+        return self._stream
+    
+    def _stop_stream(self):
+        """Pause the input stream between recordings without closing it"""
+        if self._stream is not None and not self._stream.is_stopped():
+            self._stream.stop_stream()
+    
+    def close(self):
+        """Close the input stream and release PortAudio"""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def record_audio(self):
+        """
+        Record audio from microphone into memory
+        
+        Returns:
+            Tuple of (mono float32 samples in [-1, 1], sample rate)
+        """
+        n_chunks = int(self.rate / self.chunk * self.record_seconds)
+        chunk_bytes = self.chunk * self.channels * self.sample_width
+        pcm = bytearray(n_chunks * chunk_bytes)
+        
+        try:
+            stream = self._start_stream()
             
             print(f"Recording... (Speak now for {self.record_seconds} seconds)")
-            frames = []
-            
-            for _ in range(int(self.rate / self.chunk * self.record_seconds)):
-                data = stream.read(self.chunk)
-                frames.append(data)
             
-            stream.stop_stream()
-            stream.close()
+            for i in range(n_chunks):
+                pcm[i * chunk_bytes:(i + 1) * chunk_bytes] = stream.read(self.chunk)
             
-            # Save audio to WAV file
-            with wave.open(str(temp_audio_path), 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.sample_width)
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(frames))
+            self._stop_stream()
             
-            return temp_audio_path
+            return pcm_to_float32(pcm, self.audio_format, self.channels), self.rate
             
         finally:
-            pa.terminate()
+            self._stop_stream()
     
     def set_recording_duration(self, seconds):
         """Set custom recording duration"""
@@ -3,9 +3,17 @@ Base class for all voice assistant services
 """
 
 from abc import ABC, abstractmethod
+from functools import wraps
+import os
+import queue
+import shutil
 import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
 from ..config.paths_config import PathConfig
 from ..config.audio_config import *
 from ..audio.recorder import AudioRecorder
@@ -19,6 +27,29 @@ from ..speech.realtime_transcriber import RealTimeTranscriber
 from ..utils.system import SystemUtils
 from ..utils.logging import VoiceAssistantLogger
 
+def _lazy_component(factory):
+    """
+    Property that creates its component on first access and caches it
+    
+    Unlike functools.cached_property, creation holds the instance's
+    _components_lock, so threads racing on first use share one component.
+    The value is stored in the instance __dict__ under the property name.
+    """
+    name = factory.__name__
+    
+    @wraps(factory)
+    def get_component(self):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            pass
+        with self._components_lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = factory(self)
+            return self.__dict__[name]
+    
+    return property(get_component)
+
 class BaseVoiceAssistant(ABC):
     """
     Abstract base class for voice assistant services
@@ -31,6 +62,9 @@ class BaseVoiceAssistant(ABC):
     - Logging and cleanup
     """
     
+    # Longest text speak_chunks hands to Piper in one synthesis call
+    SPEECH_BATCH_MAX_CHARS = 1000
+    
     def __init__(self, service_name="VoiceAssistant", whisper_model="small"):
         """
         Initialize base voice assistant
@@ -54,10 +88,12 @@ class BaseVoiceAssistant(ABC):
         self.logger.log_service_start(service_name)
         self.logger.log_system_info()
         
-        # Initialize components
-        self._init_audio_components()
+        # Guards creation of the components that load on first use
+        self._components_lock = threading.RLock()
+        
+        # Initialize components; audio, real-time and TTS components load on first use
         self._init_speech_components(whisper_model)
-        self._init_tts_components()
+        self._start_tts_worker()
         
         # Create temporary directory
         self.temp_dir = self.paths.get_temp_dir(service_name)
@@ -65,39 +101,93 @@ class BaseVoiceAssistant(ABC):
         
         self.logger.info(f"{service_name} initialization completed")
     
-    def _init_audio_components(self):
-        """Initialize audio recording and playback components"""
-        self.logger.info("Initializing audio components...")
-        
-        self.audio_recorder = AudioRecorder()
-        self.audio_normalizer = AudioNormalizer()
-        self.audio_player = AudioPlayer()
-        
-        self.logger.info("Audio components initialized")
+    @_lazy_component
+    def audio_recorder(self):
+        """Fixed-duration recorder, opening PortAudio on first access"""
+        self.logger.info("Initializing audio recorder...")
+        return AudioRecorder()
+    
+    @_lazy_component
+    def audio_normalizer(self):
+        """Volume normalizer for recordings"""
+        return AudioNormalizer()
+    
+    @_lazy_component
+    def audio_player(self):
+        """Player for sound effects and synthesized speech, with the sound effects predecoded"""
+        self.logger.info("Initializing audio player...")
+        audio_player = AudioPlayer()
+        preloaded = audio_player.preload(self.paths.sounds_dir)
+        self.logger.info(f"Preloaded {preloaded} sound effects")
+        return audio_player
     
     def _init_speech_components(self, whisper_model):
         """Initialize speech recognition components"""
         self.logger.info(f"Initializing speech recognition with Whisper {whisper_model}...")
         
-        device = SystemUtils.get_optimal_device()
-        self.transcriber = WhisperTranscriber(whisper_model, device)
+        self.whisper_model = whisper_model
+        self.device = SystemUtils.get_optimal_device()
+        self.transcriber = WhisperTranscriber(whisper_model, self.device)
         self.text_processor = TextProcessor()
         
-        # Initialize real-time transcriber
-        self.realtime_transcriber = RealTimeTranscriber(whisper_model, device)
+        # Warm up the model in the background so the first utterance is not slowed down
+        threading.Thread(
+            target=self._warm_up_transcriber, name=f"{self.service_name}-whisper-warmup", daemon=True
+        ).start()
         
         self.logger.info("Speech recognition initialized")
     
-    def _init_tts_components(self):
-        """Initialize text-to-speech components"""
+    @_lazy_component
+    def realtime_transcriber(self):
+        """Real-time transcriber on the same Whisper model, created on first use"""
+        self.logger.info("Initializing real-time transcription...")
+        return RealTimeTranscriber(
+            self.whisper_model, self.device, shared_transcriber=self.transcriber
+        )
+    
+    def _warm_up_transcriber(self):
+        """Run one throwaway transcription of silence to load kernels and the decoder"""
+        try:
+            self.transcriber.transcribe(np.zeros(16000 * 15, dtype=np.float32), verbose=False)
+            self.logger.info("Whisper warm-up completed")
+        except Exception as e:
+            self.logger.warning(f"Whisper warm-up failed: {e}")
+    
+    @_lazy_component
+    def voice_manager(self):
+        """Piper voice manager, created on first speech"""
         self.logger.info("Initializing text-to-speech components...")
-        
-        self.voice_manager = VoiceManager(
+        voice_manager = VoiceManager(
             models_dir=self.paths.tts_models_dir,
             piper_dir=self.paths.piper_dir
         )
-        
         self.logger.info("Text-to-speech components initialized")
+        return voice_manager
+    
+    def _start_tts_worker(self):
+        """Start the background audio output thread: queued speech and sounds play in order"""
+        # Synthesis runs on its own worker so the next sentence is ready while one plays
+        self._synth_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.service_name}-synth")
+        
+        self._tts_queue = queue.Queue()
+        self._tts_thread = threading.Thread(
+            target=self._tts_worker, name=f"{self.service_name}-tts", daemon=True
+        )
+        self._tts_thread.start()
+    
+    def _tts_worker(self):
+        """Play queued speech and sound files until a None sentinel is received"""
+        while True:
+            item = self._tts_queue.get()
+            try:
+                if item is None:
+                    return
+                action, args = item
+                action(*args)
+            except Exception as e:
+                self.logger.error(f"Background audio failed: {e}")
+            finally:
+                self._tts_queue.task_done()
     
     def record_audio(self, duration=None):
         """
@@ -107,34 +197,44 @@ class BaseVoiceAssistant(ABC):
             duration: Recording duration in seconds (uses default if None)
         
         Returns:
-            Path to recorded audio file
+            Recorded mono float32 samples (16 kHz), kept in memory
         """
         if duration:
             self.audio_recorder.set_recording_duration(duration)
         
+        # Don't record the assistant's own voice
+        self.wait_for_speech()
+        
         self.logger.log_audio_event("Recording started")
-        audio_path = self.audio_recorder.record_audio(self.temp_dir)
-        self.logger.log_audio_event("Recording completed", str(audio_path))
+        audio, rate = self.audio_recorder.record_audio()
+        self.logger.log_audio_event("Recording completed", "%.2fs", len(audio) / rate)
         
-        return audio_path
+        return audio
     
-    def transcribe_audio(self, audio_path, language=None):
+    def transcribe_audio(self, audio, language=None):
         """
         Transcribe audio to text
         
         Args:
-            audio_path: Path to audio file
+            audio: Recorded float32 samples, or path to an audio file
             language: Language code (None for auto-detect)
         
         Returns:
             Transcribed text string
         """
         try:
-            # Normalize audio before transcription
-            self.audio_normalizer.normalize_audio(audio_path)
+            # Normalize audio before transcription, in memory unless the file needs resampling
+            if isinstance(audio, np.ndarray):
+                self.audio_normalizer.normalize_array(audio)
+            else:
+                samples = self.audio_normalizer.load_normalized(audio)
+                if samples is not None:
+                    audio = samples
+                else:
+                    self.audio_normalizer.normalize_audio(audio)
             
             # Transcribe
-            text = self.transcriber.transcribe(audio_path, language)
+            text = self.transcriber.transcribe(audio, language)
             
             # Clean text
             cleaned_text = self.text_processor.clean_text(text)
@@ -159,19 +259,25 @@ class BaseVoiceAssistant(ABC):
             Transcribed text string
         """
         try:
+            # Don't record the assistant's own voice
+            self.wait_for_speech()
+            
             self.logger.log_audio_event("Real-time transcription started")
             
-            # Configure language if specified
-            # Note: Whisper auto-detects language, but we can log the expected language
+            # Lock decoding to the expected language instead of detecting it per utterance
             if language:
-                self.logger.info(f"Expected language: {language}")
+                self.logger.info("Expected language: %s", language)
             
             if visual_feedback:
                 # Use visual feedback version
-                text = self.realtime_transcriber.transcribe_with_visual_feedback(self.temp_dir)
+                text = self.realtime_transcriber.transcribe_with_visual_feedback(
+                    self.temp_dir, language=language
+                )
             else:
                 # Use standard real-time transcription
-                text = self.realtime_transcriber.start_continuous_transcription(self.temp_dir)
+                text = self.realtime_transcriber.start_continuous_transcription(
+                    self.temp_dir, language=language
+                )
             
             if text:
                 # Clean text
@@ -223,7 +329,7 @@ class BaseVoiceAssistant(ABC):
             play_audio: Whether to play the audio
         
         Returns:
-            Path to generated audio file
+            Path to generated audio file when not played, None otherwise
         """
         try:
             # Clean text for better TTS pronunciation
@@ -233,10 +339,16 @@ class BaseVoiceAssistant(ABC):
                 self.logger.warning("Text is empty after cleaning for TTS")
                 return None
             
-            audio_path = self.voice_manager.speak(cleaned_text, language, play_audio)
+            # Played audio is streamed from Piper to the speaker with no WAV round-trip
+            if play_audio:
+                if self.voice_manager.speak_streamed(cleaned_text, language):
+                    self.logger.log_tts(cleaned_text, language, "audio output", original=text)
+                return None
+            
+            audio_path = self.voice_manager.speak(cleaned_text, language, play_audio=False)
             
             if audio_path:
-                self.logger.log_tts(f"Original: '{text[:100]}...' | Cleaned: '{cleaned_text}'", language, audio_path)
+                self.logger.log_tts(cleaned_text, language, audio_path, original=text)
             
             return audio_path
             
@@ -244,6 +356,72 @@ class BaseVoiceAssistant(ABC):
             self.logger.error(f"TTS failed: {e}")
             return None
     
+    def _synthesize(self, text, language):
+        """
+        Clean and synthesize text without playing it
+        
+        Args:
+            text: Text to speak
+            language: TTS language code
+        
+        Returns:
+            Path to generated audio file, or None if there was nothing to say
+        """
+        cleaned_text = TTSTextCleaner.extract_main_content(text)
+        
+        if not cleaned_text:
+            self.logger.warning("Text is empty after cleaning for TTS")
+            return None
+        
+        audio_path = self.voice_manager.synthesize_only(cleaned_text, language)
+        self.logger.log_tts(cleaned_text, language, audio_path, original=text)
+        return audio_path
+    
+    def _play_synthesized(self, future, played):
+        """Wait for a queued synthesis, play its audio and report the outcome on played"""
+        success = False
+        try:
+            audio_path = future.result()
+            if audio_path:
+                success = self.voice_manager.play(audio_path)
+        except Exception as e:
+            self.logger.error(f"TTS failed: {e}")
+        finally:
+            played.set_result(success)
+    
+    def speak_async(self, text, language="fr_FR"):
+        """
+        Queue text to be spoken by the background TTS worker
+        
+        Synthesis starts right away on the synthesis worker, so it overlaps
+        with whatever is still playing; playback keeps the queue order.
+        
+        Args:
+            text: Text to speak
+            language: TTS language code
+        
+        Returns:
+            Future resolving to True once the text has been played, False on failure
+        """
+        future = self._synth_pool.submit(self._synthesize, text, language)
+        played = Future()
+        self._tts_queue.put((self._play_synthesized, (future, played)))
+        return played
+    
+    def play_sound_file_async(self, sound_name):
+        """
+        Queue a sound file to be played by the background TTS worker
+        
+        Args:
+            sound_name: Name of sound file (e.g., 'result.mp3')
+        """
+        self._tts_queue.put((self.play_sound_file, (sound_name,)))
+    
+    def wait_for_speech(self):
+        """Block until all queued speech and sounds have been played"""
+        if hasattr(self, '_tts_queue'):
+            self._tts_queue.join()
+    
     def speak_chunks(self, text, language="fr_FR", max_chunk_length=150):
         """
         Speak long text in smaller, more natural chunks
@@ -254,29 +432,64 @@ class BaseVoiceAssistant(ABC):
             max_chunk_length: Maximum length per chunk
         
         Returns:
-            List of audio file paths generated
+            Number of chunks played
         """
         try:
-            chunks = TTSTextCleaner.format_for_speech(text, max_chunk_length)
-            audio_paths = []
+            chunks = self._batch_chunks(
+                [chunk for chunk in TTSTextCleaner.format_for_speech(text, max_chunk_length)
+                 if chunk.strip()]
+            )
+            played = 0
             
-            for i, chunk in enumerate(chunks):
-                if chunk.strip():
-                    self.logger.info(f"Speaking chunk {i+1}/{len(chunks)}: '{chunk[:50]}...'")
-                    audio_path = self.voice_manager.speak(chunk, language, True)
-                    if audio_path:
-                        audio_paths.append(audio_path)
-                    
-                    # Small pause between chunks for natural flow
-                    if i < len(chunks) - 1:
-                        import time
-                        time.sleep(0.5)
+            # Synthesize upcoming chunks on the shared worker while the current one plays
+            futures = [self._synth_pool.submit(self.voice_manager.synthesize_only, chunk, language)
+                       for chunk in chunks]
             
-            return audio_paths
+            for i, (chunk, future) in enumerate(zip(chunks, futures)):
+                try:
+                    audio_path = future.result()
+                except Exception as e:
+                    self.logger.error(f"Chunk synthesis failed: {e}")
+                    continue
+                if audio_path:
+                    self.logger.info("Speaking chunk %d/%d: '%.50s...'", i + 1, len(chunks), chunk)
+                    if self.voice_manager.play(audio_path):
+                        played += 1
+            
+            return played
             
         except Exception as e:
             self.logger.error(f"Chunked TTS failed: {e}")
+            return 0
+    
+    def _batch_chunks(self, chunks):
+        """
+        Join consecutive speech chunks so Piper synthesizes several sentences per call
+        
+        The first chunk is kept on its own so playback starts as soon as it is
+        synthesized; later batches are synthesized while earlier ones play.
+        
+        Args:
+            chunks: Sentence-sized text chunks in speaking order
+        
+        Returns:
+            List of texts: the first chunk, then joined chunks each at most
+            SPEECH_BATCH_MAX_CHARS long (unless a single chunk is longer)
+        """
+        if not chunks:
             return []
+        
+        batches = [chunks[0]]
+        current = ""
+        for chunk in chunks[1:]:
+            if current and len(current) + 1 + len(chunk) > self.SPEECH_BATCH_MAX_CHARS:
+                batches.append(current)
+                current = chunk
+            else:
+                current = f"{current} {chunk}" if current else chunk
+        if current:
+            batches.append(current)
+        return batches
     
     def play_sound_file(self, sound_name):
         """
@@ -288,6 +501,10 @@ class BaseVoiceAssistant(ABC):
         Returns:
             True if successful, False otherwise
         """
+        # Preloaded sounds skip the file lookup and decode
+        if self.audio_player.has_sound(sound_name):
+            return self.audio_player.play_cached(sound_name)
+        
         sound_path = self.paths.sounds_dir / sound_name
         
         if not sound_path.exists():
@@ -308,14 +525,28 @@ class BaseVoiceAssistant(ABC):
         self.logger.info("Cleaning up resources...")
         
         try:
-            # Clean up voice manager temp files
-            if hasattr(self, 'voice_manager'):
-                self.voice_manager.cleanup_temp_files()
+            # Stop the background TTS worker once queued audio has played
+            if hasattr(self, '_tts_queue'):
+                self._tts_queue.put(None)
+                self._tts_thread.join(timeout=30)
+                self._synth_pool.shutdown(wait=True)
+            
+            # Release the microphone streams held open between recordings;
+            # components that were never used are not created just to close them
+            if 'audio_recorder' in self.__dict__:
+                self.audio_recorder.close()
+            if 'realtime_transcriber' in self.__dict__:
+                self.realtime_transcriber.recorder.close()
+            
+            # Clean up voice manager temp files and Piper processes
+            if 'voice_manager' in self.__dict__:
+                self.voice_manager.close()
+            if 'audio_player' in self.__dict__:
+                self.audio_player.close()
             
             # Remove temporary directory
             if hasattr(self, 'temp_dir') and self.temp_dir.exists():
-                import shutil
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                self._remove_temp_dir()
                 self.logger.info(f"Removed temporary directory: {self.temp_dir}")
         
         except Exception as e:
@@ -323,6 +554,20 @@ class BaseVoiceAssistant(ABC):
         
         self.logger.log_service_stop(self.service_name)
     
+    def _remove_temp_dir(self):
+        """Delete the temp directory with one scan, falling back to rmtree for subdirectories"""
+        with os.scandir(self.temp_dir) as entries:
+            for entry in entries:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+        
+        try:
+            os.rmdir(self.temp_dir)
+        except OSError:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
     def get_supported_languages(self):
         """Get list of supported TTS languages"""
         return self.voice_manager.get_supported_languages()
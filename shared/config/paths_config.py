@@ -2,8 +2,13 @@
 Path configuration management for shared resources
 """
 
+import os
+import tempfile
 from pathlib import Path
 
+# Memory-backed filesystem used for temp audio on Linux
+SHM_DIR = Path("/dev/shm")
+
 class PathConfig:
     def __init__(self, root_dir=None):
         """Initialize path configuration with project root"""
@@ -77,16 +82,35 @@ class PathConfig:
         
         return True
     
+    @staticmethod
+    def get_temp_root():
+        """
+        Pick the parent directory for temporary audio files
+        
+        VOICE_ASSISTANT_TMPDIR overrides the choice; otherwise /dev/shm is used
+        when writable so intermediate WAVs never reach disk, falling back to the
+        system default (TMPDIR, which recent macOS already keeps in memory).
+        
+        Returns:
+            Directory path, or None for the system default
+        """
+        override = os.environ.get("VOICE_ASSISTANT_TMPDIR")
+        if override:
+            return override
+        
+        if SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK | os.X_OK):
+            return str(SHM_DIR)
+        
+        return None
+    
     def get_temp_dir(self, service_name=None):
         """Get temporary directory path for a service"""
-        import tempfile
-        
         if service_name:
             prefix = f'voice_assistant_{service_name}_'
         else:
             prefix = 'voice_assistant_'
         
-        temp_path = Path(tempfile.mkdtemp(prefix=prefix))
+        temp_path = Path(tempfile.mkdtemp(prefix=prefix, dir=self.get_temp_root()))
         return temp_path
     
     def get_all_paths(self):
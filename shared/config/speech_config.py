@@ -2,20 +2,47 @@
 Speech recognition configuration settings
 """
 
+import os
+
 # Whisper model configuration
 DEFAULT_WHISPER_MODEL = "small"  # Default model size
 WHISPER_MODELS = ["tiny", "small", "medium", "large"]
 
-# Device configuration for Whisper
+# Device configuration for Whisper (int8 weights via CTranslate2)
 COMPUTE_TYPE_MAPPING = {
+    "cuda": "int8_float16",
+    "cpu": "int8"
+}
+
+# Unquantized compute types, used when quantization is turned off
+FULL_PRECISION_COMPUTE_TYPES = {
     "cuda": "float16",
     "cpu": "float32"
 }
 
+# Optional override of the compute type for every device (e.g. "float16", "float32")
+WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE")
+
+# Concurrent transcriptions the model can run (partial and final passes overlap)
+WHISPER_NUM_WORKERS = 2
+
+# CPU threads per worker, splitting the cores between the workers instead of oversubscribing
+WHISPER_CPU_THREADS = max(1, (os.cpu_count() or 1) // WHISPER_NUM_WORKERS)
+
 # Transcription settings
 DEFAULT_TRANSCRIPTION_LANGUAGE = None  # Auto-detect
 TRANSCRIPTION_TASK = "transcribe"  # or "translate"
 
+# Decoding for live transcription: greedy, no conditioning on earlier text (avoids
+# hallucination loops), and Silero VAD to skip the silence around the speech
+REALTIME_DECODE_OPTIONS = {
+    "beam_size": 1,
+    "best_of": 1,
+    "condition_on_previous_text": False,
+    "vad_filter": True,
+    "vad_parameters": {"min_silence_duration_ms": 500},
+}
+
 # Text processing settings
 TEXT_CLEANUP_PATTERNS = [
     r'\s+',  # Multiple spaces
@@ -5,26 +5,39 @@ Real-time speech transcription with streaming capabilities
 import threading
 import time
 import queue
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from pathlib import Path
+
+import numpy as np
+
 from .whisper_transcriber import WhisperTranscriber
+from ..config.speech_config import REALTIME_DECODE_OPTIONS
 from .text_processor import TextProcessor
 from ..audio.realtime_recorder import RealTimeRecorder
+from ..audio import buffer_pool
 
 class RealTimeTranscriber:
-    def __init__(self, whisper_model="small", device=None):
+    # Partial results: new audio handed over per step, and the recent audio re-transcribed
+    PARTIAL_SEGMENT_SECONDS = 1.0
+    PARTIAL_CONTEXT_SECONDS = 15.0
+    
+    def __init__(self, whisper_model="small", device=None, shared_transcriber=None):
         """
         Initialize real-time transcriber
         
         Args:
             whisper_model: Whisper model size
             device: Device to use (cuda/cpu)
+            shared_transcriber: Existing WhisperTranscriber to reuse instead of loading a second model
         """
-        self.transcriber = WhisperTranscriber(whisper_model, device)
+        if shared_transcriber is not None:
+            self.transcriber = shared_transcriber
+        else:
+            self.transcriber = WhisperTranscriber(whisper_model, device)
         self.text_processor = TextProcessor()
         self.recorder = RealTimeRecorder()
         
-        # Threading and queue management
-        self.transcription_queue = queue.Queue()
+        # Transcription state
         self.is_active = False
         self.current_transcription = ""
         
@@ -60,64 +73,132 @@ class RealTimeTranscriber:
         if self.on_speech_event:
             self.on_speech_event(event)
     
-    def _transcription_worker(self, audio_path):
-        """Worker thread for audio transcription"""
+    def _transcription_worker(self, audio, result, language=None):
+        """
+        Worker thread for audio transcription of in-memory samples
+        
+        Args:
+            audio: Float32 samples from the buffer pool (released when done)
+            result: Future set to the cleaned text, or to the transcription error
+            language: Language code to decode in (None for auto-detect)
+        """
         try:
-            if audio_path and audio_path.exists():
+            if audio is not None and len(audio) > 0:
                 # Transcribe the audio
-                text = self.transcriber.transcribe(audio_path)
+                text = self.transcriber.transcribe(audio, language, **REALTIME_DECODE_OPTIONS)
                 
                 # Clean the text
                 cleaned_text = self.text_processor.clean_text(text)
                 
                 # Check if text is meaningful
-                if self.text_processor.is_empty_or_nonsense(cleaned_text):
+                if self.text_processor.is_empty_or_nonsense(cleaned_text, already_cleaned=True):
                     cleaned_text = ""
                 
-                # Put result in queue
-                self.transcription_queue.put({
-                    'type': 'final',
-                    'text': cleaned_text,
-                    'raw_text': text
-                })
+                result.set_result(cleaned_text)
+            else:
+                result.set_result("")
                 
         except Exception as e:
-            self.transcription_queue.put({
-                'type': 'error',
-                'error': str(e)
-            })
+            result.set_exception(e)
+        
+        finally:
+            # The samples came from the shared buffer pool; hand them back for the next recording
+            if audio is not None:
+                buffer_pool.release(audio)
     
-    def start_continuous_transcription(self, temp_dir=None, max_duration=30.0):
+    def _partial_transcription_worker(self, segments, stop, language=None):
+        """
+        Re-transcribe the most recent audio as segments arrive and emit partial results
+        
+        Args:
+            segments: Queue of float32 segments from the recorder, ended by None
+            stop: threading.Event set when recording ends, abandoning the current pass
+            language: Language code to decode in (None for auto-detect)
+        """
+        max_samples = int(self.PARTIAL_CONTEXT_SECONDS * self.recorder.rate)
+        context = np.zeros(0, dtype=np.float32)
+        finished = False
+        
+        while not finished:
+            # Take everything recorded while the previous pass was running
+            batch = [segments.get()]
+            while not segments.empty():
+                batch.append(segments.get_nowait())
+            
+            new_audio = [segment for segment in batch if segment is not None]
+            finished = len(new_audio) < len(batch)
+            if new_audio:
+                context = np.concatenate([context] + new_audio)[-max_samples:]
+                for segment in new_audio:
+                    buffer_pool.release(segment)
+            
+            if finished or stop.is_set():
+                break
+            
+            try:
+                text = self.transcriber.transcribe(context, language, verbose=False,
+                                                   stop_event=stop, **REALTIME_DECODE_OPTIONS)
+                if stop.is_set():
+                    break
+                text = self.text_processor.clean_text(text)
+                if text and self.on_partial_result:
+                    self.on_partial_result(text)
+            except Exception as e:
+                print(f"Partial transcription error: {e}")
+    
+    def start_continuous_transcription(self, temp_dir=None, max_duration=30.0, language=None):
         """
         Start continuous transcription with real-time feedback
         
         Args:
-            temp_dir: Directory for temporary files
+            temp_dir: Unused; recordings are passed to Whisper in memory
             max_duration: Maximum recording duration
+            language: Language code to decode in (None for auto-detect)
         
         Returns:
             Final transcribed text or None
         """
         self.is_active = True
         
+        # Transcribe while recording so partial results follow the speech; the
+        # partial pass is stopped when recording ends so it does not compete with
+        # the final transcription for CPU threads
+        segments = None
+        stop_partial = threading.Event()
+        if self.on_partial_result:
+            segments = queue.Queue()
+            threading.Thread(
+                target=self._partial_transcription_worker,
+                args=(segments, stop_partial, language),
+                daemon=True
+            ).start()
+        
         try:
-            # Start recording with silence detection
-            audio_path = self.recorder.record_with_silence_detection(
-                temp_dir=temp_dir,
-                max_duration=max_duration,
-                volume_callback=self._volume_callback,
-                speech_callback=self._speech_callback
-            )
+            # Start recording with silence detection, keeping the samples in memory
+            try:
+                audio = self.recorder.record_array_with_silence_detection(
+                    max_duration=max_duration,
+                    volume_callback=self._volume_callback,
+                    speech_callback=self._speech_callback,
+                    segment_callback=segments.put if segments else None,
+                    segment_seconds=self.PARTIAL_SEGMENT_SECONDS
+                )
+            finally:
+                if segments:
+                    stop_partial.set()
+                    segments.put(None)
             
-            if not audio_path:
+            if audio is None:
                 if self.on_final_result:
                     self.on_final_result("")
                 return ""
             
-            # Start transcription in background
+            # Start transcription in background; a fresh Future per recording means a
+            # timed-out result can never be picked up by the next call
+            result = Future()
             transcription_thread = threading.Thread(
                 target=self._transcription_worker,
-                args=(audio_path,),
+                args=(audio, result, language),
                 daemon=True
             )
             transcription_thread.start()
@@ -128,27 +209,24 @@ class RealTimeTranscriber:
             
             # Wait for transcription result
             try:
-                result = self.transcription_queue.get(timeout=30.0)
+                final_text = result.result(timeout=30.0)
+                
+                if self.on_final_result:
+                    self.on_final_result(final_text)
                 
-                if result['type'] == 'final':
-                    final_text = result['text']
-                    
-                    if self.on_final_result:
-                        self.on_final_result(final_text)
-                    
-                    return final_text
-                    
-                elif result['type'] == 'error':
-                    print(f"Transcription error: {result['error']}")
-                    if self.on_final_result:
-                        self.on_final_result("")
-                    return ""
+                return final_text
                 
-            except queue.Empty:
+            except FutureTimeoutError:
                 print("Transcription timed out")
                 if self.on_final_result:
                     self.on_final_result("")
                 return ""
+            
+            except Exception as e:
+                print(f"Transcription error: {e}")
+                if self.on_final_result:
+                    self.on_final_result("")
+                return ""
         
         except Exception as e:
             print(f"Real-time transcription error: {e}")
@@ -159,10 +237,14 @@ class RealTimeTranscriber:
         finally:
             self.is_active = False
     
-    def transcribe_with_visual_feedback(self, temp_dir=None):
+    def transcribe_with_visual_feedback(self, temp_dir=None, language=None):
         """
         Transcribe with visual feedback showing audio levels and speech detection
         
+        Args:
+            temp_dir: Unused; recordings are passed to Whisper in memory
+            language: Language code to decode in (None for auto-detect)
+        
         Returns:
             Transcribed text
         """
@@ -203,18 +285,22 @@ class RealTimeTranscriber:
             elif event == "processing":
                 print("🔄 Processing audio...")
         
+        def partial_callback(text):
+            print(f"\n💬 Partial: '{text}'")
+        
         def final_callback(text):
             print(f"\n📝 Transcription: '{text}'")
         
         # Set callbacks
         self.set_callbacks(
+            on_partial_result=partial_callback,
             on_volume_update=volume_callback,
             on_speech_event=speech_callback,
             on_final_result=final_callback
         )
         
         # Start transcription
-        result = self.start_continuous_transcription(temp_dir)
+        result = self.start_continuous_transcription(temp_dir, language=language)
         
         print("="*60)
         return result
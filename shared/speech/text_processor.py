@@ -3,10 +3,87 @@ Text processing utilities for speech recognition output
 """
 
 import re
+import string
+from functools import lru_cache
 from ..config.speech_config import TEXT_CLEANUP_PATTERNS
 
+# Optional Aho-Corasick automaton for keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Patterns compiled once at import instead of looked up on every call
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-\.\,\;\:\!\?\'\"]+')
+
+# Same filter as _SPECIAL_CHARS_RE for ASCII text, applied by str.translate in one C loop
+_KEPT_ASCII = set(string.ascii_letters + string.digits + string.whitespace + "_-.,;:!?'\"")
+_SPECIAL_ASCII_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in _KEPT_ASCII))
+_NON_WORD_RE = re.compile(r'[^\w]')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+class KeywordMatcher:
+    """Find any of a fixed set of keywords in a text with a single scan"""
+    
+    def __init__(self, keywords, whole_words=False):
+        """
+        Build the matcher once for a set of keywords
+        
+        Args:
+            keywords: Iterable of keywords (matched case-insensitively)
+            whole_words: Only match keywords delimited by word boundaries
+        """
+        keywords = [keyword.lower() for keyword in keywords]
+        self.whole_words = whole_words
+        
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+            self._pattern = None
+        else:
+            # Longest keywords first so overlapping matches prefer the longer one
+            self._automaton = None
+            alternation = "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+            if whole_words:
+                alternation = rf"\b(?:{alternation})\b"
+            self._pattern = re.compile(alternation)
+    
+    def find(self, text):
+        """
+        Find the first keyword contained in text
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Matched keyword (lowercase), or None
+        """
+        if not text:
+            return None
+        
+        text = text.lower()
+        
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text):
+                if not self.whole_words or self._is_whole_word(text, end - len(keyword) + 1, end + 1):
+                    return keyword
+            return None
+        
+        match = self._pattern.search(text)
+        return match.group(0) if match else None
+    
+    @staticmethod
+    def _is_whole_word(text, start, end):
+        """Check that text[start:end] is not part of a longer word"""
+        return ((start == 0 or not text[start - 1].isalnum() and text[start - 1] != '_') and
+                (end == len(text) or not text[end].isalnum() and text[end] != '_'))
+
 class TextProcessor:
     @staticmethod
+    @lru_cache(maxsize=512)
     def clean_text(text):
         """
         Clean and normalize text output from speech recognition
@@ -20,14 +97,15 @@ class TextProcessor:
         if not text or not isinstance(text, str):
             return ""
         
-        # Apply cleanup patterns
-        cleaned_text = text
+        # Remove excessive whitespace (split/join also drops it at both ends)
+        cleaned_text = ' '.join(text.split())
         
-        # Remove excessive whitespace
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-        
-        # Remove non-printable characters (keep basic punctuation)
-        cleaned_text = re.sub(r'[^\w\s\-\.\,\;\:\!\?\'\"]', '', cleaned_text)
+        # Remove non-printable characters (keep basic punctuation); the regex is
+        # only needed for Unicode word characters
+        if cleaned_text.isascii():
+            cleaned_text = cleaned_text.translate(_SPECIAL_ASCII_TABLE)
+        else:
+            cleaned_text = _SPECIAL_CHARS_RE.sub('', cleaned_text)
         
         # Remove leading/trailing whitespace
         cleaned_text = cleaned_text.strip()
@@ -55,20 +133,21 @@ class TextProcessor:
         
         for word in words:
             # Remove punctuation and check length
-            clean_word = re.sub(r'[^\w]', '', word)
+            clean_word = _NON_WORD_RE.sub('', word)
             if len(clean_word) >= min_length:
                 keywords.append(clean_word)
         
         return keywords
     
     @staticmethod
-    def is_empty_or_nonsense(text, min_length=2):
+    def is_empty_or_nonsense(text, min_length=2, already_cleaned=False):
         """
         Check if text is empty or appears to be nonsense
         
         Args:
             text: Input text to check
             min_length: Minimum meaningful length
+            already_cleaned: text is the output of clean_text, so skip cleaning it again
         
         Returns:
             True if text appears empty or nonsensical
@@ -76,7 +155,7 @@ class TextProcessor:
         if not text or not isinstance(text, str):
             return True
         
-        cleaned = TextProcessor.clean_text(text)
+        cleaned = text if already_cleaned else TextProcessor.clean_text(text)
         
         # Check if text is too short
         if len(cleaned) < min_length:
@@ -87,16 +166,12 @@ class TextProcessor:
         if len(words) == 0:
             return True
         
-        # Check for common nonsense patterns
-        nonsense_patterns = [
-            r'^[a-z]\s*$',  # Single letter
-            r'^[.,!?]+$',   # Only punctuation
-            r'^\d+$',       # Only numbers
-        ]
-        
-        for pattern in nonsense_patterns:
-            if re.match(pattern, cleaned.lower()):
-                return True
+        # Check for common nonsense patterns: a single letter, only punctuation, only numbers
+        lowered = cleaned.lower()
+        if len(lowered) == 1 and 'a' <= lowered <= 'z':
+            return True
+        if not lowered.strip('.,!?') or lowered.isdecimal():
+            return True
         
         return False
     
@@ -137,7 +212,7 @@ class TextProcessor:
             return []
         
         # Simple sentence splitting on common punctuation
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
         
         # Clean and filter empty sentences
         cleaned_sentences = []
@@ -2,19 +2,28 @@
 Whisper-based speech recognition wrapper
 """
 
+import numpy as np
 import torch
 from faster_whisper import WhisperModel
 from pathlib import Path
 from ..config.speech_config import *
 
+# Batched decoding of VAD-split segments (faster-whisper >= 1.1)
+try:
+    from faster_whisper import BatchedInferencePipeline
+    BATCHED_PIPELINE_AVAILABLE = True
+except ImportError:
+    BATCHED_PIPELINE_AVAILABLE = False
+
 class WhisperTranscriber:
-    def __init__(self, model_size=DEFAULT_WHISPER_MODEL, device=None):
+    def __init__(self, model_size=DEFAULT_WHISPER_MODEL, device=None, quantize=True):
         """
         Initialize Whisper transcriber
         
         Args:
             model_size: Whisper model size (tiny, small, medium, large)
             device: Device to use (cuda/cpu), auto-detected if None
+            quantize: Run with int8 weights (False for float16/float32)
         """
         self.model_size = model_size
         
@@ -24,8 +33,9 @@ class WhisperTranscriber:
         else:
             self.device = device
         
-        # Set compute type based on device
-        self.compute_type = COMPUTE_TYPE_MAPPING.get(self.device, "float32")
+        # Set compute type based on device, unless overridden from the environment
+        compute_types = COMPUTE_TYPE_MAPPING if quantize else FULL_PRECISION_COMPUTE_TYPES
+        self.compute_type = WHISPER_COMPUTE_TYPE or compute_types.get(self.device, "float32")
         
         print(f"Initializing Whisper model: {self.model_size} on {self.device} with {self.compute_type}")
         
@@ -34,84 +44,117 @@ class WhisperTranscriber:
             self.model = WhisperModel(
                 self.model_size,
                 device=self.device,
-                compute_type=self.compute_type
+                compute_type=self.compute_type,
+                cpu_threads=WHISPER_CPU_THREADS,
+                num_workers=WHISPER_NUM_WORKERS
             )
             print("Whisper model loaded successfully")
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Whisper model: {e}")
+        
+        self.batched = BatchedInferencePipeline(model=self.model) if BATCHED_PIPELINE_AVAILABLE else None
     
-    def transcribe(self, audio_path, language=DEFAULT_TRANSCRIPTION_LANGUAGE, task=TRANSCRIPTION_TASK):
+    @staticmethod
+    def _audio_source(audio):
         """
-        Transcribe audio file to text
+        Resolve the audio argument into something faster-whisper can decode
         
         Args:
-            audio_path: Path to audio file
-            language: Language code for transcription (None for auto-detect)
-            task: Task type ('transcribe' or 'translate')
+            audio: Path to an audio file, or 16 kHz mono float32 samples
         
         Returns:
-            Transcribed text as string
+            Tuple of (model input, description for logging)
         """
-        audio_path = Path(audio_path)
+        if isinstance(audio, np.ndarray):
+            return audio, f"in-memory audio ({len(audio) / 16000:.2f}s)"
         
+        audio_path = Path(audio)
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        return str(audio_path), str(audio_path)
+    
+    def transcribe(self, audio, language=DEFAULT_TRANSCRIPTION_LANGUAGE, task=TRANSCRIPTION_TASK,
+                   verbose=True, stop_event=None, **decode_options):
+        """
+        Transcribe audio to text
+        
+        Args:
+            audio: Path to audio file, or 16 kHz mono float32 samples
+            language: Language code for transcription (None for auto-detect)
+            task: Task type ('transcribe' or 'translate')
+            verbose: Print progress and the result (off for partial transcriptions)
+            stop_event: threading.Event that stops decoding after the current segment
+            **decode_options: Extra faster-whisper decoding options (e.g. beam_size)
+        
+        Returns:
+            Transcribed text as string
+        """
+        source, description = self._audio_source(audio)
         
         try:
-            print(f"Transcribing audio: {audio_path}")
+            if verbose:
+                print(f"Transcribing audio: {description}")
             
             # Perform transcription
             segments, info = self.model.transcribe(
-                str(audio_path),
+                source,
                 language=language,
-                task=task
+                task=task,
+                **decode_options
             )
             
-            # Combine all segments into single text
-            transcribed_text = " ".join([segment.text for segment in segments])
+            # Combine all segments into single text; segments are decoded lazily,
+            # so stopping here skips the remaining decode work
+            texts = []
+            for segment in segments:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                texts.append(segment.text)
+            transcribed_text = " ".join(texts)
             
-            print(f"Detected language: {info.language} (probability: {info.language_probability:.2f})")
-            print(f"Transcription: {transcribed_text}")
+            if verbose:
+                print(f"Detected language: {info.language} (probability: {info.language_probability:.2f})")
+                print(f"Transcription: {transcribed_text}")
             
             return transcribed_text.strip()
             
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {e}")
     
-    def transcribe_with_info(self, audio_path, language=DEFAULT_TRANSCRIPTION_LANGUAGE, task=TRANSCRIPTION_TASK):
+    def transcribe_with_info(self, audio, language=DEFAULT_TRANSCRIPTION_LANGUAGE, task=TRANSCRIPTION_TASK):
         """
         Transcribe audio and return detailed information
         
+        Args:
+            audio: Path to audio file, or 16 kHz mono float32 samples
+        
         Returns:
             Dictionary with text, language, probability, and segments
         """
-        audio_path = Path(audio_path)
-        
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        source, _ = self._audio_source(audio)
         
         try:
             segments, info = self.model.transcribe(
-                str(audio_path),
+                source,
                 language=language,
                 task=task
             )
             
-            # Convert segments to list for JSON serialization
+            # Convert segments to list for JSON serialization (the generator is consumed once)
             segment_list = []
-            transcribed_text = ""
+            texts = []
             
             for segment in segments:
-                segment_info = {
+                text = segment.text
+                segment_list.append({
                     "start": segment.start,
                     "end": segment.end,
-                    "text": segment.text
-                }
-                segment_list.append(segment_info)
-                transcribed_text += segment.text + " "
+                    "text": text
+                })
+                texts.append(text)
             
             result = {
-                "text": transcribed_text.strip(),
+                "text": " ".join(texts).strip(),
                 "language": info.language,
                 "language_probability": info.language_probability,
                 "segments": segment_list
@@ -122,6 +165,43 @@ class WhisperTranscriber:
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {e}")
     
+    def transcribe_batch(self, audios, language=DEFAULT_TRANSCRIPTION_LANGUAGE, task=TRANSCRIPTION_TASK,
+                         batch_size=8):
+        """
+        Transcribe several recordings, decoding the speech segments of each in batches
+        
+        With faster-whisper's BatchedInferencePipeline, silence is dropped by VAD and
+        the remaining segments go through the encoder/decoder batch_size at a time;
+        older faster-whisper versions fall back to transcribing one file at a time.
+        
+        Args:
+            audios: Iterable of audio file paths or 16 kHz mono float32 sample arrays
+            language: Language code for transcription (None for auto-detect)
+            task: Task type ('transcribe' or 'translate')
+            batch_size: Segments decoded together
+        
+        Returns:
+            List of transcribed texts, in input order
+        """
+        if self.batched is None:
+            return [self.transcribe(audio, language, task, verbose=False, vad_filter=True)
+                    for audio in audios]
+        
+        texts = []
+        for audio in audios:
+            source, _ = self._audio_source(audio)
+            try:
+                segments, _ = self.batched.transcribe(
+                    source,
+                    language=language,
+                    task=task,
+                    batch_size=batch_size
+                )
+                texts.append(" ".join(segment.text for segment in segments).strip())
+            except Exception as e:
+                raise RuntimeError(f"Transcription failed: {e}")
+        return texts
+    
     def set_model_size(self, model_size):
         """Change Whisper model size"""
         if model_size not in WHISPER_MODELS:
@@ -133,8 +213,11 @@ class WhisperTranscriber:
         self.model = WhisperModel(
             self.model_size,
             device=self.device,
-            compute_type=self.compute_type
+            compute_type=self.compute_type,
+            cpu_threads=WHISPER_CPU_THREADS,
+            num_workers=WHISPER_NUM_WORKERS
         )
+        self.batched = BatchedInferencePipeline(model=self.model) if BATCHED_PIPELINE_AVAILABLE else None
         print(f"Switched to Whisper model: {model_size}")
     
     def is_cuda_available(self):
@@ -2,10 +2,40 @@
 Piper TTS wrapper for text-to-speech functionality
 """
 
+import json
+import queue
+import shutil
 import subprocess
 import tempfile
+import threading
+import wave
+import weakref
+from functools import lru_cache
 from pathlib import Path
 from ..config.tts_config import TTS_MODELS, LANGUAGE_CODES, DEFAULT_MODELS_DIR, DEFAULT_PIPER_DIR
+from ..config.paths_config import PathConfig
+
+# Optional in-process Piper (piper-tts package): keeps the ONNX session loaded between calls
+try:
+    from piper.voice import PiperVoice
+    PIPER_PYTHON_AVAILABLE = True
+except ImportError:
+    PIPER_PYTHON_AVAILABLE = False
+
+# Bytes read from Piper's raw output per playback write (~90 ms of 22 kHz 16-bit audio)
+RAW_READ_SIZE = 4096
+
+# Seconds to wait for a long-lived Piper process to answer one request
+PROCESS_TIMEOUT = 30
+
+# Seconds a long-lived Piper process gets to exit on close before it is killed
+PROCESS_CLOSE_TIMEOUT = 1
+
+@lru_cache(maxsize=None)
+def _config_sample_rate(config_path):
+    """Read the output sample rate from a Piper model config"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)["audio"]["sample_rate"]
 
 class PiperTTS:
     def __init__(self, models_dir=None, piper_dir=None):
@@ -22,8 +52,18 @@ class PiperTTS:
         # Set Piper executable path
         self.piper_exe = self.piper_dir / "piper.exe"
         
-        # Verify Piper executable exists
-        if not self.piper_exe.exists():
+        # Loaded voices keyed by model path, reused by every synthesis
+        self._voices = {}
+        self._voices_lock = threading.Lock()
+        
+        # Long-lived Piper processes keyed by model path, each with its own lock
+        # and a queue of the output paths its reader thread has received
+        self._processes = {}
+        self._processes_lock = threading.Lock()
+        self._process_output_dir = None
+        
+        # Verify Piper executable exists (not needed when Piper runs in-process)
+        if not PIPER_PYTHON_AVAILABLE and not self.piper_exe.exists():
             raise FileNotFoundError(f"Piper executable not found at {self.piper_exe}")
     
     def get_model_paths(self, language):
@@ -67,6 +107,19 @@ class PiperTTS:
         else:
             output_path = Path(output_path)
         
+        if PIPER_PYTHON_AVAILABLE:
+            try:
+                return self._synthesize_in_process(text, model_path, config_path, output_path)
+            except Exception as e:
+                if not self.piper_exe.exists():
+                    raise RuntimeError(f"TTS synthesis error: {e}") from e
+                print(f"In-process Piper failed, falling back to executable: {e}")
+        
+        try:
+            return self._synthesize_persistent(text, model_path, config_path, output_path)
+        except Exception as e:
+            print(f"Persistent Piper process failed, running Piper once: {e}")
+        
         # Build Piper command
         cmd = [
             str(self.piper_exe),
@@ -97,6 +150,217 @@ class PiperTTS:
         except Exception as e:
             raise RuntimeError(f"TTS synthesis error: {e}") from e
     
+    def _get_process(self, model_path, config_path):
+        """
+        Start a Piper process for a voice on first use and keep it running
+        
+        The process reads one JSON request per line, writes each utterance to a
+        WAV file in a private directory and prints that file's path.
+        
+        Returns:
+            Tuple of (Popen, lock serializing requests to it, queue of output lines)
+        """
+        with self._processes_lock:
+            entry = self._processes.get(model_path)
+            if entry is not None and entry[0].poll() is None:
+                return entry
+            
+            if self._process_output_dir is None:
+                self._process_output_dir = tempfile.mkdtemp(prefix='piper_', dir=PathConfig.get_temp_root())
+                weakref.finalize(self, shutil.rmtree, self._process_output_dir, True)
+            
+            process = subprocess.Popen(
+                [
+                    str(self.piper_exe),
+                    "--model", str(model_path),
+                    "--config", str(config_path),
+                    "--json-input",
+                    "--output_dir", self._process_output_dir
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding='utf-8',
+                bufsize=1
+            )
+            lines = queue.Queue()
+            threading.Thread(
+                target=self._read_process_output, args=(process, lines), daemon=True
+            ).start()
+            
+            entry = (process, threading.Lock(), lines)
+            self._processes[model_path] = entry
+            return entry
+    
+    @staticmethod
+    def _read_process_output(process, lines):
+        """Forward a Piper process's output lines to a queue, then None once it exits"""
+        try:
+            for line in process.stdout:
+                lines.put(line.strip())
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+    
+    def _discard_process(self, model_path, process):
+        """Kill a misbehaving Piper process so the next request starts a fresh one"""
+        with self._processes_lock:
+            entry = self._processes.get(model_path)
+            if entry is not None and entry[0] is process:
+                del self._processes[model_path]
+        process.kill()
+    
+    def _synthesize_persistent(self, text, model_path, config_path, output_path):
+        """
+        Synthesize with the voice's long-lived Piper process
+        
+        Args:
+            text: Text to synthesize
+            model_path: Piper ONNX model path
+            config_path: Piper model config path
+            output_path: Output WAV file path
+        
+        Returns:
+            Path to generated audio file
+        """
+        process, lock, lines = self._get_process(model_path, config_path)
+        
+        with lock:
+            try:
+                process.stdin.write(json.dumps({"text": text}) + "\n")
+                process.stdin.flush()
+                generated = lines.get(timeout=PROCESS_TIMEOUT)
+            except queue.Empty:
+                self._discard_process(model_path, process)
+                raise RuntimeError(f"Piper process did not answer within {PROCESS_TIMEOUT}s")
+            except OSError:
+                self._discard_process(model_path, process)
+                raise
+        
+        if not generated:
+            self._discard_process(model_path, process)
+            raise RuntimeError("Piper process exited without producing audio")
+        
+        shutil.move(generated, output_path)
+        return output_path
+    
+    def close(self):
+        """Stop the long-lived Piper processes and remove their output directory"""
+        with self._processes_lock:
+            for process, _, _ in self._processes.values():
+                try:
+                    process.stdin.close()
+                    process.wait(timeout=PROCESS_CLOSE_TIMEOUT)
+                except Exception:
+                    process.kill()
+            self._processes.clear()
+            
+            if self._process_output_dir is not None:
+                shutil.rmtree(self._process_output_dir, ignore_errors=True)
+                self._process_output_dir = None
+    
+    def synthesize_stream(self, text, language):
+        """
+        Synthesize speech as raw PCM without writing a WAV file
+        
+        Args:
+            text: Text to synthesize
+            language: Language code (e.g., 'fr_FR', 'en_US', 'french', 'english')
+        
+        Returns:
+            Tuple of (sample rate, iterator of 16-bit mono PCM byte chunks)
+        """
+        model_path, config_path = self.get_model_paths(language)
+        sample_rate = _config_sample_rate(str(config_path))
+        
+        if PIPER_PYTHON_AVAILABLE:
+            voice = self._get_voice(model_path, config_path)
+            return sample_rate, self._stream_in_process(voice, text)
+        
+        return sample_rate, self._stream_subprocess(text, model_path, config_path)
+    
+    @staticmethod
+    def _stream_in_process(voice, text):
+        """Yield PCM chunks from a resident Piper voice"""
+        # piper-tts 1.3 yields AudioChunk objects from synthesize()
+        if hasattr(voice, 'synthesize_wav'):
+            for chunk in voice.synthesize(text):
+                yield chunk.audio_int16_bytes
+        else:
+            yield from voice.synthesize_stream_raw(text)
+    
+    def _stream_subprocess(self, text, model_path, config_path):
+        """Yield PCM chunks from Piper's stdout as the executable produces them"""
+        cmd = [
+            str(self.piper_exe),
+            "--model", str(model_path),
+            "--config", str(config_path),
+            "--output_raw"
+        ]
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.DEVNULL)
+        
+        # Feed the text from another thread so a long input cannot fill the stdin
+        # pipe while Piper is blocked writing audio we have not read yet
+        def feed():
+            try:
+                process.stdin.write(text.encode('utf-8'))
+            finally:
+                process.stdin.close()
+        
+        threading.Thread(target=feed, daemon=True).start()
+        
+        try:
+            while True:
+                chunk = process.stdout.read(RAW_READ_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        except GeneratorExit:
+            # Playback stopped early; don't leave Piper running
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            process.wait()
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"Piper TTS failed with exit code {process.returncode}")
+    
+    def _get_voice(self, model_path, config_path):
+        """Load a Piper voice on first use and keep its ONNX session resident"""
+        with self._voices_lock:
+            voice = self._voices.get(model_path)
+            if voice is None:
+                voice = PiperVoice.load(str(model_path), config_path=str(config_path))
+                self._voices[model_path] = voice
+            return voice
+    
+    def _synthesize_in_process(self, text, model_path, config_path, output_path):
+        """
+        Synthesize with a resident Piper voice instead of starting the executable
+        
+        Args:
+            text: Text to synthesize
+            model_path: Piper ONNX model path
+            config_path: Piper model config path
+            output_path: Output WAV file path
+        
+        Returns:
+            Path to generated audio file
+        """
+        voice = self._get_voice(model_path, config_path)
+        
+        with wave.open(str(output_path), 'wb') as wav_file:
+            # piper-tts 1.3 renamed synthesize() to synthesize_wav()
+            if hasattr(voice, 'synthesize_wav'):
+                voice.synthesize_wav(text, wav_file)
+            else:
+                voice.synthesize(text, wav_file)
+        
+        return output_path
+    
     def is_language_supported(self, language):
         """Check if a language is supported"""
         lang_code = LANGUAGE_CODES.get(language.lower(), language)
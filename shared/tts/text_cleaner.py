@@ -3,11 +3,28 @@ Text cleaning utilities for TTS to remove markdown and formatting
 """
 
 import re
+from functools import lru_cache
+
+# Cleanup patterns compiled once at import instead of looked up on every call
+_HUMAN_RE = re.compile(r'^Human:\s*Question:\s*', re.IGNORECASE)
+_HEADER_RE = re.compile(r'#{1,6}\s*')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+_NUM_BOLD_RE = re.compile(r'^\s*\d+\.\s*\*\*([^*]+)\*\*\s*:\s*', re.MULTILINE)
+_NUMBERED_RE = re.compile(r'^\s*\d+\.\s*', re.MULTILINE)
+_BULLET_RE = re.compile(r'^\s*[-*+]\s*', re.MULTILINE)
+_PARENS_RE = re.compile(r'\([^)]*\)')
+_TRAILING_COLON_RE = re.compile(r':\s*$')
+_DOTS_RE = re.compile(r'\.+')
+# Lines extract_main_content drops: question echoes and bare list numbers
+_SKIP_LINE_RE = re.compile(r'Human:|Question:|\d+\.\s*$')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
 
 class TTSTextCleaner:
     """Clean text for better TTS pronunciation"""
     
     @staticmethod
+    @lru_cache(maxsize=512)
     def clean_for_tts(text):
         """
         Clean text to make it suitable for TTS by removing markdown formatting
@@ -22,32 +39,30 @@ class TTSTextCleaner:
             return ""
         
         # Remove "Human: Question:" prefix if present
-        text = re.sub(r'^Human:\s*Question:\s*', '', text, flags=re.IGNORECASE)
+        text = _HUMAN_RE.sub('', text)
         
         # Remove markdown headers (### ** etc.)
-        text = re.sub(r'#{1,6}\s*', '', text)  # Remove ### headers
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # **bold** -> bold
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)  # *italic* -> italic
+        text = _HEADER_RE.sub('', text)  # Remove ### headers
+        text = _BOLD_RE.sub(r'\1', text)  # **bold** -> bold
+        text = _ITALIC_RE.sub(r'\1', text)  # *italic* -> italic
         
         # Remove list formatting
-        text = re.sub(r'^\s*\d+\.\s*\*\*([^*]+)\*\*\s*:\s*', r'\1: ', text, flags=re.MULTILINE)  # 3. **Result:** -> Result:
-        text = re.sub(r'^\s*\d+\.\s*', '', text, flags=re.MULTILINE)  # Remove numbered lists
-        text = re.sub(r'^\s*[-*+]\s*', '', text, flags=re.MULTILINE)  # Remove bullet points
+        text = _NUM_BOLD_RE.sub(r'\1: ', text)  # 3. **Result:** -> Result:
+        text = _NUMBERED_RE.sub('', text)  # Remove numbered lists
+        text = _BULLET_RE.sub('', text)  # Remove bullet points
         
-        # Clean up bullet points and asterisks
-        text = re.sub(r'^\s*\*\s*', '', text, flags=re.MULTILINE)  # Remove * at line start
-        text = re.sub(r'\*', '', text)  # Remove remaining asterisks
+        # Remove remaining asterisks (whitespace left around them is collapsed next)
+        text = text.replace('*', '')
         
-        # Remove excessive whitespace and newlines
-        text = re.sub(r'\n+', ' ', text)  # Replace multiple newlines with space
-        text = re.sub(r'\s+', ' ', text)  # Replace multiple spaces with single space
+        # Collapse whitespace, newlines included, to single spaces
+        text = ' '.join(text.split())
         
         # Remove parenthetical notes that are too technical for speech
-        text = re.sub(r'\([^)]*\)', '', text)
+        text = _PARENS_RE.sub('', text)
         
         # Clean up common formatting artifacts
-        text = re.sub(r':\s*$', '.', text)  # Replace trailing colons with periods
-        text = re.sub(r'\.+', '.', text)  # Replace multiple periods with single period
+        text = _TRAILING_COLON_RE.sub('.', text)  # Replace trailing colons with periods
+        text = _DOTS_RE.sub('.', text)  # Replace multiple periods with single period
         
         # Ensure sentences end properly
         text = text.strip()
@@ -57,6 +72,7 @@ class TTSTextCleaner:
         return text.strip()
     
     @staticmethod
+    @lru_cache(maxsize=512)
     def extract_main_content(text):
         """
         Extract the main response content, removing metadata and formatting
@@ -79,12 +95,8 @@ class TTSTextCleaner:
             if not line:
                 continue
                 
-            # Skip lines that are just question echoes
-            if line.startswith('Human:') or line.startswith('Question:'):
-                continue
-                
-            # Skip lines that are just numbers or formatting
-            if re.match(r'^\d+\.\s*$', line):
+            # Skip question echoes and lines that are just numbers or formatting
+            if _SKIP_LINE_RE.match(line):
                 continue
                 
             content_lines.append(line)
@@ -105,13 +117,20 @@ class TTSTextCleaner:
         Returns:
             List of text chunks suitable for TTS
         """
+        # Cached as a tuple; each caller gets its own list
+        return list(TTSTextCleaner._format_for_speech(text, max_length))
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _format_for_speech(text, max_length):
+        """Cached implementation of format_for_speech returning a tuple of chunks"""
         cleaned_text = TTSTextCleaner.extract_main_content(text)
         
         if len(cleaned_text) <= max_length:
-            return [cleaned_text] if cleaned_text else []
+            return (cleaned_text,) if cleaned_text else ()
         
         # Split into sentences
-        sentences = re.split(r'[.!?]+', cleaned_text)
+        sentences = _SENTENCE_SPLIT_RE.split(cleaned_text)
         chunks = []
         current_chunk = ""
         
@@ -135,4 +154,4 @@ class TTSTextCleaner:
         if current_chunk:
             chunks.append(current_chunk.strip() + ".")
         
-        return chunks
\ No newline at end of file
+        return tuple(chunks)
\ No newline at end of file
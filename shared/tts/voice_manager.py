@@ -4,15 +4,24 @@ Voice management and TTS orchestration
 
 from .piper_tts import PiperTTS
 from ..audio.player import AudioPlayer
+from ..config.paths_config import PathConfig
 from pathlib import Path
+import os
+import shutil
 import tempfile
+import weakref
 
 class VoiceManager:
     def __init__(self, models_dir=None, piper_dir=None):
         """Initialize voice manager with TTS and audio player"""
         self.tts = PiperTTS(models_dir, piper_dir)
         self.audio_player = AudioPlayer()
-        self.temp_files = []  # Track temporary files for cleanup
+        self.temp_files = set()  # Synthesized files still waiting to be played or cleaned up
+        
+        # Session directory for synthesized speech (in RAM where available); removed
+        # by the finalizer even if close() is never called
+        self.session_dir = Path(tempfile.mkdtemp(prefix='voice_manager_', dir=PathConfig.get_temp_root()))
+        self._remove_session_dir = weakref.finalize(self, shutil.rmtree, str(self.session_dir), True)
     
     def speak(self, text, language="fr_FR", play_audio=True, save_path=None):
         """
@@ -25,28 +34,97 @@ class VoiceManager:
             save_path: Path to save the audio file (optional)
         
         Returns:
-            Path to generated audio file
+            Path to the audio file when it was saved or not played, None once a
+            temporary file has been played and deleted
         """
         try:
             # Generate audio file
-            if save_path:
-                audio_path = self.tts.synthesize(text, language, save_path)
-            else:
-                audio_path = self.tts.synthesize(text, language)
-                self.temp_files.append(audio_path)  # Track for cleanup
+            audio_path = self.synthesize_only(text, language, save_path)
             
-            # Play audio if requested
-            if play_audio:
-                success = self.audio_player.play_wav(audio_path)
-                if not success:
-                    print("Warning: Failed to play synthesized audio")
+            if not play_audio:
+                return audio_path
             
-            return audio_path
+            self.play(audio_path)
+            return audio_path if save_path else None
             
         except Exception as e:
             print(f"Error in voice synthesis: {e}")
             return None
     
+    def speak_streamed(self, text, language="fr_FR"):
+        """
+        Speak text by playing Piper's audio as it is generated, without a WAV file
+        
+        Plays a temporary WAV file instead when streaming playback is unavailable
+        or the stream fails before any audio was played.
+        
+        Args:
+            text: Text to speak
+            language: Language for TTS
+        
+        Returns:
+            True if the text was spoken, False otherwise
+        """
+        if self.audio_player.pcm_stream_available:
+            try:
+                sample_rate, chunks = self.tts.synthesize_stream(text, language)
+                if self.audio_player.play_pcm_stream(chunks, sample_rate):
+                    return True
+            except Exception as e:
+                print(f"Error in streamed voice synthesis: {e}")
+            print("Warning: Streamed playback failed, playing from a WAV file instead")
+        
+        try:
+            return self.play(self.synthesize_only(text, language))
+        except Exception as e:
+            print(f"Error in voice synthesis: {e}")
+            return False
+    
+    def synthesize_only(self, text, language="fr_FR", save_path=None):
+        """
+        Convert text to speech without playing it
+        
+        Args:
+            text: Text to speak
+            language: Language for TTS
+            save_path: Path to save the audio file (optional)
+        
+        Returns:
+            Path to generated audio file
+        """
+        if save_path:
+            return self.tts.synthesize(text, language, save_path)
+        
+        fd, temp_name = tempfile.mkstemp(suffix='.wav', dir=self.session_dir)
+        os.close(fd)
+        audio_path = self.tts.synthesize(text, language, temp_name)
+        self.temp_files.add(audio_path)  # Track for cleanup
+        return audio_path
+    
+    def play(self, audio_path):
+        """
+        Play a synthesized audio file, blocking until it finishes
+        
+        Temporary files from synthesize_only() are deleted once played.
+        
+        Args:
+            audio_path: Path to the WAV file
+        
+        Returns:
+            True if playback succeeded, False otherwise
+        """
+        success = self.audio_player.play_wav(audio_path)
+        if not success:
+            print("Warning: Failed to play synthesized audio")
+        
+        if audio_path in self.temp_files:
+            self.temp_files.discard(audio_path)
+            try:
+                Path(audio_path).unlink()
+            except OSError:
+                pass
+        return success
+    
     def speak_file(self, file_path, language="fr_FR", play_audio=True):
         """
         Read text from file and speak it
@@ -57,7 +135,7 @@ class VoiceManager:
             play_audio: Whether to play the audio
         
         Returns:
-            Path to generated audio file
+            Path to generated audio file, None once a temporary one has been played
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -83,7 +161,7 @@ class VoiceManager:
     
     def cleanup_temp_files(self):
         """Clean up temporary audio files"""
-        for temp_file in self.temp_files:
+        for temp_file in list(self.temp_files):
             try:
                 if temp_file.exists():
                     temp_file.unlink()
@@ -92,6 +170,9 @@ class VoiceManager:
         
         self.temp_files.clear()
     
-    def __del__(self):
-        """Cleanup when object is destroyed"""
-        self.cleanup_temp_files()
\ No newline at end of file
+    def close(self):
+        """Delete temporary audio files, stop the Piper processes and release the speaker"""
+        self.cleanup_temp_files()
+        self.tts.close()
+        self.audio_player.close()
+        self._remove_session_dir()
\ No newline at end of file
@@ -61,29 +61,33 @@ class VoiceAssistantLogger:
         self.logger.info(f"Logger initialized: {name}")
         self.logger.info(f"Log file: {log_filename}")
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log info message"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log error message"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log debug message"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def critical(self, message):
+    def critical(self, message, *args):
         """Log critical message"""
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
     
-    def exception(self, message):
+    def exception(self, message, *args):
         """Log exception with traceback"""
-        self.logger.exception(message)
+        self.logger.exception(message, *args)
+    
+    def isEnabledFor(self, level):
+        """Check whether messages at the given level would be emitted"""
+        return self.logger.isEnabledFor(level)
     
     def log_system_info(self):
         """Log system information"""
@@ -109,15 +113,29 @@ class VoiceAssistantLogger:
         """Log service shutdown"""
         self.info(f"=== Stopping {service_name} ===")
     
-    def log_audio_event(self, event_type, details=None):
-        """Log audio-related events"""
-        message = f"Audio Event: {event_type}"
-        if details:
-            message += f" - {details}"
-        self.info(message)
+    def log_audio_event(self, event_type, details=None, *args):
+        """
+        Log audio-related events
+        
+        Args:
+            event_type: Short event name
+            details: Optional detail text, %-formatted with args only when args are given
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        if details and args:
+            self.logger.info("Audio Event: %s - %s", event_type, details % args)
+        elif details:
+            self.logger.info("Audio Event: %s - %s", event_type, details)
+        else:
+            self.logger.info("Audio Event: %s", event_type)
     
     def log_transcription(self, text, language=None, confidence=None):
         """Log speech transcription results"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         message = f"Transcription: '{text}'"
         if language:
             message += f" (Language: {language}"
@@ -126,9 +144,21 @@ class VoiceAssistantLogger:
             message += ")"
         self.info(message)
     
-    def log_tts(self, text, language, output_path):
-        """Log text-to-speech synthesis"""
-        self.info(f"TTS Synthesis: '{text}' -> {output_path} (Language: {language})")
+    def log_tts(self, text, language, output_path, original=None):
+        """
+        Log text-to-speech synthesis
+        
+        Args:
+            text: Text sent to the synthesizer
+            language: TTS language code
+            output_path: Generated audio file
+            original: Text before cleaning, logged (first 100 characters) alongside text
+        """
+        if original is None:
+            self.logger.info("TTS Synthesis: '%s' -> %s (Language: %s)", text, output_path, language)
+        else:
+            self.logger.info("TTS Synthesis: 'Original: '%.100s...' | Cleaned: '%s'' -> %s (Language: %s)",
+                             original, text, output_path, language)
     
     def log_error_with_context(self, error, context=None):
         """Log error with contextual information"""
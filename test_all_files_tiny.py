@@ -81,13 +81,15 @@ def analyze_results(results):
     print("DETAILED RESULTS BY CATEGORY")
     print(f"{'='*80}")
 
+    results_by_file = {r['file']: r for r in results}
+
     for category, files in categories.items():
         print(f"\n{category}:")
         print("-" * len(category))
 
         category_results = []
         for file in files:
-            result = next((r for r in results if r['file'] == file), None)
+            result = results_by_file.get(file)
             if result:
                 category_results.append(result)
                 if 'text' in result:
@@ -44,15 +44,15 @@ def test_sensitivity_levels():
         config = get_sensitivity_config(preset_name)
         
         recorder = RealTimeRecorder(
-            silence_threshold=config['threshold'],
-            silence_duration=config['duration'],
-            min_recording_time=config['min_recording']
+            silence_threshold=config.threshold,
+            silence_duration=config.duration,
+            min_recording_time=config.min_recording
         )
         
         print(f"\nTesting '{preset_name}' sensitivity:")
-        print(f"- {config['description']}")
-        print(f"- Threshold: {config['threshold']}")
-        print(f"- Silence duration: {config['duration']}s")
+        print(f"- {config.description}")
+        print(f"- Threshold: {config.threshold}")
+        print(f"- Silence duration: {config.duration}s")
         
     elif choice == '6':
         print("\nCustom sensitivity configuration:")
@@ -74,12 +74,12 @@ def test_sensitivity_levels():
         try:
             config = get_sensitivity_config(choice)
             recorder = RealTimeRecorder(
-                silence_threshold=config['threshold'],
-                silence_duration=config['duration'],
-                min_recording_time=config['min_recording']
+                silence_threshold=config.threshold,
+                silence_duration=config.duration,
+                min_recording_time=config.min_recording
             )
             print(f"\nTesting '{choice}' sensitivity:")
-            print(f"- {config['description']}")
+            print(f"- {config.description}")
         except ValueError:
             print(f"Unknown preset: {choice}")
             return False
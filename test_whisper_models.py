@@ -115,6 +115,9 @@ def main():
     print(f"{'='*80}")
 
     categories = categorize_test_files()
+    results_by_file = {
+        model: {r['file']: r for r in all_results[model]} for model in models_to_test
+    }
 
     for category, files in categories.items():
         print(f"\n{category}:")
@@ -123,7 +126,7 @@ def main():
         for file in files:
             print(f"\n{file}:")
             for model in models_to_test:
-                result = next((r for r in all_results[model] if r['file'] == file), None)
+                result = results_by_file[model].get(file)
                 if result and 'text' in result:
                     print(f"  {model.upper()}: {result['text']}")
                     print(f"    Time: {result['processing_time']:.2f}s | Confidence: {result['confidence']:.3f}")
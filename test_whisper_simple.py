@@ -100,12 +100,16 @@ def main():
     print("COMPARISON RESULTS")
     print(f"{'='*80}")
 
+    results_by_file = {
+        model: {r['file']: r for r in all_results[model]} for model in models
+    }
+
     for test_file in test_files:
         print(f"\n{test_file}:")
         print("-" * len(test_file))
 
         for model in models:
-            result = next((r for r in all_results[model] if r['file'] == test_file), None)
+            result = results_by_file[model].get(test_file)
             if result:
                 if 'text' in result:
                     print(f"  {model.upper()}: {result['text']}")